@@ -0,0 +1,108 @@
+"""Memory-mapped on-disk store for TF-IDF matrices and padded token sequences.
+
+Each entry is a directory of ``.npy`` files plus a ``meta.json``:
+
+- CSR matrices keep their ``data``, ``indices`` and ``indptr`` arrays.
+- Dense arrays (e.g. int32 padded sequences) are a single ``array.npy``.
+
+Entries are opened with ``mmap_mode="r"``, so explainers read them without
+copying and parallel workers (joblib forwards memmap-backed arrays by file
+name) share the same pages instead of each unpickling a private copy.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import scipy.sparse as sp
+
+
+Feature = Union[np.ndarray, sp.csr_matrix]
+
+_CSR_PARTS = ("data", "indices", "indptr")
+
+
+def _load_npy(path: Path, mmap: bool) -> np.ndarray:
+    array = np.load(path, mmap_mode="r" if mmap else None)
+    # Zero-length arrays cannot be mapped; fall back to a regular load.
+    return np.load(path) if mmap and array.size == 0 else array
+
+
+class FeatureStore:
+    """A directory of named, memory-mappable feature arrays."""
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+
+    def __contains__(self, name: str) -> bool:
+        """Return whether a complete entry called name exists."""
+        return (self.root / name / "meta.json").exists()
+
+    def names(self) -> List[str]:
+        """List the stored entry names."""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.name in self)
+
+    def save(self, name: str, value: Any) -> None:
+        """
+        Write a sparse matrix or dense array under name, replacing any old entry.
+
+        Sparse inputs are stored as CSR. The entry is written to a temporary
+        directory first and renamed into place, so readers never observe a
+        partially written entry.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=self.root, prefix=f".{name}."))
+
+        try:
+            if sp.issparse(value):
+                csr = sp.csr_matrix(value)
+                csr.sort_indices()
+                for part in _CSR_PARTS:
+                    np.save(tmp / f"{part}.npy", getattr(csr, part))
+                meta: Dict[str, Any] = {
+                    "kind": "csr",
+                    "dtype": str(csr.dtype),
+                    "shape": list(csr.shape),
+                }
+            else:
+                array = np.asarray(value)
+                np.save(tmp / "array.npy", array)
+                meta = {
+                    "kind": "dense",
+                    "dtype": str(array.dtype),
+                    "shape": list(array.shape),
+                }
+
+            (tmp / "meta.json").write_text(json.dumps(meta))
+
+            target = self.root / name
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(tmp, target)
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp)
+
+    def load(self, name: str, mmap: bool = True) -> Feature:
+        """Open an entry, memory-mapped read-only unless mmap is False."""
+        if name not in self:
+            raise KeyError(f"Feature not found in store {self.root}: {name}")
+
+        entry = self.root / name
+        meta = json.loads((entry / "meta.json").read_text())
+
+        if meta["kind"] == "csr":
+            data, indices, indptr = (
+                _load_npy(entry / f"{part}.npy", mmap) for part in _CSR_PARTS
+            )
+            return sp.csr_matrix(
+                (data, indices, indptr), shape=tuple(meta["shape"]), copy=False
+            )
+
+        return _load_npy(entry / "array.npy", mmap)
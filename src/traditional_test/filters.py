@@ -0,0 +1,190 @@
+"""Vectorised top-activating n-gram analysis for the CNN's Conv1D filters."""
+
+from typing import Any, Iterator, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+DEFAULT_BATCH_SIZE = 256
+
+
+def encode_ngram_windows(
+    X_pad: np.ndarray, kernel_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode every convolution window of X_pad as an integer n-gram key.
+
+    Returns
+    -------
+    keys : np.ndarray
+        Shape (num_docs, seq_len - kernel_size + 1). The key of the window
+        starting at each position, or -1 for windows made only of padding.
+    windows : np.ndarray
+        Shape (num_keys, kernel_size). The token ids of each distinct window,
+        indexed by key, so only the winning keys ever need decoding.
+    """
+    X_pad = np.asarray(X_pad)
+    views = sliding_window_view(X_pad, kernel_size, axis=1)
+    rows = np.ascontiguousarray(views.reshape(-1, kernel_size))
+
+    windows, inverse = np.unique(rows, axis=0, return_inverse=True)
+    keys = inverse.reshape(views.shape[:2]).astype(np.int64)
+
+    padding_only = ~windows.any(axis=1)
+    keys[padding_only[keys]] = -1
+
+    return keys, windows
+
+
+def decode_ngram(window: np.ndarray, index_word: Mapping[int, str]) -> str:
+    """Decode a window of token ids into an n-gram string, skipping padding."""
+    return " ".join(index_word.get(int(t), "<UNK>") for t in window if t != 0)
+
+
+def conv_activation_batches(
+    conv_model: Any,
+    X_pad: np.ndarray,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield (start_row, activations) for consecutive batches of X_pad."""
+    for start in range(0, len(X_pad), batch_size):
+        batch = np.asarray(X_pad[start : start + batch_size], dtype=np.int32)
+        yield start, np.asarray(conv_model(batch, training=False))
+
+
+class FilterNgramStats:
+    """
+    Streaming per-filter and global n-gram statistics for Conv1D activations.
+
+    Global n-gram means are accumulated with ``np.bincount`` over the integer
+    window keys, summing every positive activation across filters exactly as
+    the notebook's groupby did. Per-filter top-k positions are kept with
+    ``np.argpartition``: each batch is cut down to its own top-k rows per
+    filter before it is merged with the running top-k, so neither the full
+    (docs x positions x filters) tensor nor a full-size copy of a batch is
+    ever materialised.
+    """
+
+    def __init__(self, keys: np.ndarray, windows: np.ndarray, top_k: int = 10) -> None:
+        self.keys = keys
+        self.windows = windows
+        self.top_k = top_k
+        self.num_positions = keys.shape[1]
+        self.sums = np.zeros(len(windows), dtype=np.float64)
+        self.counts = np.zeros(len(windows), dtype=np.float64)
+        self.top_values: np.ndarray = np.empty((0, 0))
+        self.top_index: np.ndarray = np.empty((0, 0), dtype=np.int64)
+
+    def update(self, start: int, activations: np.ndarray) -> None:
+        """
+        Add the activations of rows [start, start + len(activations)).
+
+        Filters are processed one column at a time: each column feeds the
+        global sums and is reduced to its own top_k rows before merging with
+        the running top-k, so temporaries stay at (docs x positions) per
+        filter instead of copies of the whole batch.
+        """
+        num_docs, num_positions, num_filters = activations.shape
+        keys = self.keys[start : start + num_docs].ravel()
+        flat = activations.reshape(-1, num_filters)
+        valid = keys >= 0
+
+        k = min(self.top_k, len(flat))
+        values = np.empty((k, num_filters), dtype=flat.dtype)
+        rows = np.empty((k, num_filters), dtype=np.int64)
+        positive_sum = np.zeros(len(flat))
+        positive_count = np.zeros(len(flat))
+
+        for f in range(num_filters):
+            column = flat[:, f]
+            positive = column > 0
+            positive_sum += np.where(positive, column, 0.0)
+            positive_count += positive
+
+            column = np.where(valid, column, -np.inf)
+            best = np.argpartition(column, len(column) - k)[len(column) - k :]
+            values[:, f] = column[best]
+            rows[:, f] = best
+
+        self.sums += np.bincount(
+            keys[valid], weights=positive_sum[valid], minlength=len(self.sums)
+        )
+        self.counts += np.bincount(
+            keys[valid], weights=positive_count[valid], minlength=len(self.counts)
+        )
+
+        index = start * num_positions + rows
+        if self.top_values.size:
+            values = np.concatenate([self.top_values, values])
+            index = np.concatenate([self.top_index, index])
+
+        if len(values) > self.top_k:
+            keep = np.argpartition(-values, self.top_k - 1, axis=0)[: self.top_k]
+            values = np.take_along_axis(values, keep, axis=0)
+            index = np.take_along_axis(index, keep, axis=0)
+
+        self.top_values = values
+        self.top_index = np.ascontiguousarray(index)
+
+    def global_ngrams(
+        self, index_word: Mapping[int, str], top_n: int = 20, ascending: bool = False
+    ) -> pd.Series:
+        """Top (or bottom) n-grams by mean activation, decoding only the winners."""
+        seen = np.flatnonzero(self.counts)
+        means = self.sums[seen] / self.counts[seen]
+
+        order = np.argsort(means if ascending else -means, kind="stable")[:top_n]
+        return pd.Series(
+            means[order],
+            index=[decode_ngram(self.windows[k], index_word) for k in seen[order]],
+            name="activation",
+        )
+
+    def filter_top_positions(self, index_word: Mapping[int, str]) -> pd.DataFrame:
+        """Per-filter top-k (doc, position, n-gram, activation), best first."""
+        order = np.argsort(-self.top_values, axis=0, kind="stable")
+        values = np.take_along_axis(self.top_values, order, axis=0)
+        index = np.take_along_axis(self.top_index, order, axis=0)
+
+        rank, filt = np.nonzero(values > 0)
+        flat = index[rank, filt]
+        docs, positions = np.divmod(flat, self.num_positions)
+        ngram_keys = self.keys[docs, positions]
+
+        return pd.DataFrame(
+            {
+                "filter": filt,
+                "rank": rank,
+                "doc": docs,
+                "position": positions,
+                "activation": values[rank, filt],
+                "ngram": [
+                    decode_ngram(self.windows[k], index_word) for k in ngram_keys
+                ],
+            }
+        ).sort_values(["filter", "rank"], ignore_index=True)
+
+
+def analyze_conv_filters(
+    conv_model: Any,
+    X_pad: np.ndarray,
+    kernel_size: int,
+    *,
+    top_k: int = 10,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> FilterNgramStats:
+    """
+    Run conv_model over X_pad in batches and collect n-gram statistics.
+
+    conv_model maps padded token ids to Conv1D activations of shape
+    (batch, seq_len - kernel_size + 1, num_filters).
+    """
+    keys, windows = encode_ngram_windows(X_pad, kernel_size)
+    stats = FilterNgramStats(keys, windows, top_k=top_k)
+
+    for start, activations in conv_activation_batches(conv_model, X_pad, batch_size):
+        stats.update(start, activations)
+
+    return stats
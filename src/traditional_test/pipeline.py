@@ -0,0 +1,704 @@
+"""Headless, cached experiment runner for the traditional XAI track.
+
+Runs the steps of ``xai-experiment.ipynb`` as named stages. Every stage output
+is stored on disk under a content-addressed key derived from the input data
+hash, the stage's own config and the keys of its upstream stages, so changing
+an explainer setting only recomputes that explainer.
+
+Usage:
+    python -m traditional_test.pipeline --data data_job_posts.csv \
+        --stages shap lime --set lime.index=22
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy.stats import spearmanr
+from sklearn.feature_extraction.text import (
+    CountVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.utils import resample
+from sklearn.utils.class_weight import compute_class_weight
+
+from traditional_test.feature_store import FeatureStore
+
+
+DATA_PATH = "./data_job_posts.csv"
+CACHE_DIR = "./.cache/traditional_test"
+
+TEXT_COLS = ["Title", "JobDescription", "JobRequirment", "RequiredQual"]
+LABEL_COL = "IT"
+
+DEFAULT_CONFIG: Dict[str, Dict[str, Any]] = {
+    "split": {"test_size": 0.3, "val_fraction": 0.5, "len_bins": 6, "seed": 42},
+    "vectorize": {"ngram_range": [1, 2], "min_df": 5, "max_df": 0.9},
+    "fit": {"max_iter": 500},
+    "shap": {"top_n": 20, "batch_size": 512},
+    "lime": {"index": 22, "num_features": 10, "seed": 42},
+    "masking": {"top_k": 300},
+    "stability": {"num_bootstrap": 10, "seed": 42, "n_jobs": 1},
+    "tokenize": {"max_vocab": 30000, "max_len": 512},
+    "saliency": {
+        "emb_dim": 100,
+        "epochs": 3,
+        "batch_size": 32,
+        "num_seeds": 5,
+        "num_eval": 100,
+        "seed": 42,
+    },
+}
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A named pipeline step and the stages whose outputs it consumes."""
+
+    name: str
+    deps: Tuple[str, ...]
+    run: Callable[..., Any]
+    summarize: Callable[[Any], Any] = lambda output: output
+    features: Tuple[str, ...] = ()  # output keys kept in the memory-mapped store
+    requires: Tuple[str, ...] = ()  # packages the stage imports lazily
+
+
+def file_hash(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_job_posts(path: Union[str, Path]) -> pd.DataFrame:
+    """Load and clean the job postings, building ``full_text`` and ``text_len``."""
+    df = pd.read_csv(path, delimiter=",")
+    df = df[TEXT_COLS + [LABEL_COL]].dropna(subset=TEXT_COLS).copy()
+    df[LABEL_COL] = df[LABEL_COL].astype(int)
+
+    df["full_text"] = (
+        df["Title"]
+        + " \n "
+        + df["JobDescription"]
+        + " \n "
+        + df["JobRequirment"]
+        + " \n "
+        + df["RequiredQual"]
+    ).str.lower()
+    df["text_len"] = df["full_text"].str.split().str.len()
+    return df
+
+
+def balanced_class_weight(y: np.ndarray) -> Dict[int, float]:
+    """Compute 'balanced' class weights as a {label: weight} dict."""
+    classes = np.unique(y)
+    weights = compute_class_weight(class_weight="balanced", classes=classes, y=y)
+    return {int(c): float(w) for c, w in zip(classes, weights)}
+
+
+def _text_pipeline(vec: Dict[str, Any], fit: Dict[str, Any]) -> Pipeline:
+    return Pipeline([("tfidf", vec["vectorizer"]), ("clf", fit["model"])])
+
+
+def run_split(cfg: Dict[str, Any], data_path: str) -> Dict[str, pd.DataFrame]:
+    """Stratified train/val/test split on label x length quantile."""
+    df = load_job_posts(data_path)
+    len_bin = pd.qcut(df["text_len"], q=cfg["len_bins"], duplicates="drop")
+    strata = df[LABEL_COL].astype(str) + "_" + len_bin.astype(str)
+
+    train_df, temp_df = train_test_split(
+        df, test_size=cfg["test_size"], stratify=strata, random_state=cfg["seed"]
+    )
+    val_df, test_df = train_test_split(
+        temp_df,
+        test_size=cfg["val_fraction"],
+        stratify=strata.loc[temp_df.index],
+        random_state=cfg["seed"],
+    )
+    return {"train": train_df, "val": val_df, "test": test_df}
+
+
+def run_vectorize(
+    cfg: Dict[str, Any], split: Dict[str, pd.DataFrame]
+) -> Dict[str, Any]:
+    """
+    Fit TF-IDF on the training split and transform all splits.
+
+    Also keeps the raw term counts of the training split over the fitted
+    vocabulary (``C_train``), from which the bootstrap stability stage
+    re-weights resampled rows instead of re-tokenizing the text.
+    """
+    vectorizer = TfidfVectorizer(
+        ngram_range=tuple(cfg["ngram_range"]),
+        min_df=cfg["min_df"],
+        max_df=cfg["max_df"],
+        stop_words="english",
+    )
+    X_train = vectorizer.fit_transform(split["train"]["full_text"])
+
+    return {
+        "vectorizer": vectorizer,
+        "feature_names": vectorizer.get_feature_names_out(),
+        "X_train": X_train,
+        "X_val": vectorizer.transform(split["val"]["full_text"]),
+        "X_test": vectorizer.transform(split["test"]["full_text"]),
+        "C_train": CountVectorizer(
+            vocabulary=vectorizer.vocabulary_, ngram_range=vectorizer.ngram_range
+        ).transform(split["train"]["full_text"]),
+    }
+
+
+def run_fit(
+    cfg: Dict[str, Any], split: Dict[str, pd.DataFrame], vec: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Train the class-weighted logistic regression and report val/test metrics."""
+    y_train = split["train"][LABEL_COL].values
+    class_weight = balanced_class_weight(y_train)
+
+    model = LogisticRegression(max_iter=cfg["max_iter"], class_weight=class_weight)
+    model.fit(vec["X_train"], y_train)
+
+    metrics = {}
+    for name in ("val", "test"):
+        X, y = vec[f"X_{name}"], split[name][LABEL_COL].values
+        metrics[name] = {
+            "report": classification_report(y, model.predict(X), output_dict=True),
+            "roc_auc": float(roc_auc_score(y, model.predict_proba(X)[:, 1])),
+        }
+
+    return {"model": model, "class_weight": class_weight, "metrics": metrics}
+
+
+def run_shap(
+    cfg: Dict[str, Any], vec: Dict[str, Any], fit: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Rank TF-IDF features by mean |SHAP| value on the test split."""
+    import shap  # noqa: PLC0415
+
+    explainer = shap.LinearExplainer(
+        fit["model"], vec["X_train"], feature_names=vec["feature_names"]
+    )
+
+    X_test = vec["X_test"]
+    abs_sum = np.zeros(X_test.shape[1])
+    for start in range(0, X_test.shape[0], cfg["batch_size"]):
+        values = explainer.shap_values(X_test[start : start + cfg["batch_size"]])
+        abs_sum += np.abs(values).sum(axis=0)
+
+    mean_abs = pd.Series(abs_sum / X_test.shape[0], index=vec["feature_names"])
+    return {
+        "mean_abs_shap": mean_abs,
+        "top_features": mean_abs.sort_values(ascending=False).head(cfg["top_n"]),
+        "bottom_features": (
+            mean_abs[mean_abs > 0].sort_values(ascending=True).head(cfg["top_n"])
+        ),
+    }
+
+
+def run_lime(
+    cfg: Dict[str, Any],
+    split: Dict[str, pd.DataFrame],
+    vec: Dict[str, Any],
+    fit: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Explain a single test document with LIME."""
+    from lime.lime_text import LimeTextExplainer  # noqa: PLC0415
+
+    text_clf = _text_pipeline(vec, fit)
+    explainer = LimeTextExplainer(
+        class_names=["non-IT", "IT"], random_state=cfg["seed"]
+    )
+    exp = explainer.explain_instance(
+        split["test"].iloc[cfg["index"]]["full_text"],
+        text_clf.predict_proba,
+        num_features=cfg["num_features"],
+    )
+    return {"weights": exp.as_list(), "html": exp.as_html()}
+
+
+def _mask_features(texts: pd.Series, features: Sequence[str]) -> pd.Series:
+    pattern = r"\b(" + "|".join(map(re.escape, features)) + r")\b"
+    return texts.str.replace(pattern, "", regex=True)
+
+
+def run_masking(
+    cfg: Dict[str, Any],
+    split: Dict[str, pd.DataFrame],
+    vec: Dict[str, Any],
+    fit: Dict[str, Any],
+) -> Dict[str, float]:
+    """Measure the validation accuracy drop after masking top IT / non-IT features."""
+    text_clf = _text_pipeline(vec, fit)
+    texts, y = split["val"]["full_text"], split["val"][LABEL_COL]
+    order = np.argsort(fit["model"].coef_[0])
+    top_k = cfg["top_k"]
+
+    base_acc = accuracy_score(y, text_clf.predict(texts))
+    drops = {"base_accuracy": float(base_acc)}
+    for name, idx in (("it", order[-top_k:]), ("non_it", order[:top_k])):
+        masked = _mask_features(texts, vec["feature_names"][idx])
+        drops[f"drop_top_{name}"] = float(
+            base_acc - accuracy_score(y, text_clf.predict(masked))
+        )
+    return drops
+
+
+def mean_pairwise_spearman(vectors: Sequence[np.ndarray]) -> float:
+    """Average Spearman correlation over all pairs of explanation vectors."""
+    corrs = [
+        spearmanr(vectors[i], vectors[j]).correlation
+        for i in range(len(vectors))
+        for j in range(i + 1, len(vectors))
+    ]
+    return float(np.mean(corrs))
+
+
+def spearman_between_dicts(d1: Dict[str, float], d2: Dict[str, float]) -> float:
+    """Spearman correlation of two token -> score dicts over their shared tokens."""
+    common = sorted(set(d1) & set(d2))
+    return float(
+        spearmanr([d1[k] for k in common], [d2[k] for k in common]).correlation
+    )
+
+
+def _bootstrap_abs_coef(
+    counts: Any,
+    y: np.ndarray,
+    idx: np.ndarray,
+    tfidf_params: Dict[str, Any],
+    lr_params: Dict[str, Any],
+) -> np.ndarray:
+    """Refit TF-IDF weights and the LR on one bootstrap sample of count rows."""
+    X = TfidfTransformer(**tfidf_params).fit_transform(counts[idx])
+    clf = LogisticRegression(**lr_params).fit(X, y[idx])
+    return np.abs(clf.coef_[0])
+
+
+def run_stability(
+    cfg: Dict[str, Any],
+    split: Dict[str, pd.DataFrame],
+    vec: Dict[str, Any],
+    fit: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Bootstrap stability of |coef| explanations for the logistic regression.
+
+    Each bootstrap refits IDF weights on the resampled rows of the stored
+    count matrix, which matches re-vectorizing the resampled texts with a
+    frozen-vocabulary TfidfVectorizer. Workers receive the memory-mapped
+    matrix by reference, so ``n_jobs > 1`` does not copy it per process.
+    """
+    counts, y = vec["C_train"], split["train"][LABEL_COL].values
+    n = counts.shape[0]
+    tfidf = vec["vectorizer"]
+    tfidf_params = {"norm": tfidf.norm, "sublinear_tf": tfidf.sublinear_tf}
+    lr_params = {
+        "max_iter": fit["model"].max_iter,
+        "class_weight": fit["class_weight"],
+    }
+
+    coef_list = Parallel(n_jobs=cfg["n_jobs"])(
+        delayed(_bootstrap_abs_coef)(
+            counts,
+            y,
+            resample(
+                np.arange(n), replace=True, n_samples=n, random_state=cfg["seed"] + k
+            ),
+            tfidf_params,
+            lr_params,
+        )
+        for k in range(cfg["num_bootstrap"])
+    )
+
+    return {"lr_stability": mean_pairwise_spearman(coef_list)}
+
+
+def run_tokenize(cfg: Dict[str, Any], split: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """Fit the Keras tokenizer on the training split and pad all splits to int32."""
+    from tensorflow.keras.preprocessing.sequence import pad_sequences  # noqa: PLC0415
+    from tensorflow.keras.preprocessing.text import Tokenizer  # noqa: PLC0415
+
+    tokenizer = Tokenizer(num_words=cfg["max_vocab"], oov_token="<UNK>")
+    tokenizer.fit_on_texts(split["train"]["full_text"])
+
+    def pad(df: pd.DataFrame) -> np.ndarray:
+        seqs = tokenizer.texts_to_sequences(df["full_text"])
+        return pad_sequences(
+            seqs,
+            maxlen=cfg["max_len"],
+            padding="post",
+            truncating="post",
+            dtype="int32",
+        )
+
+    return {
+        "tokenizer": tokenizer,
+        "X_train": pad(split["train"]),
+        "X_val": pad(split["val"]),
+        "X_test": pad(split["test"]),
+    }
+
+
+def run_saliency(
+    cfg: Dict[str, Any],
+    split: Dict[str, pd.DataFrame],
+    tok: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Train the CNN over several seeds and compare global token saliency.
+
+    Class weights are recomputed from the training labels rather than read
+    from the ``fit`` stage, so logistic-regression settings do not invalidate
+    the cached CNN runs.
+    """
+    import tensorflow as tf  # noqa: PLC0415
+    from tensorflow.keras import layers, models  # noqa: PLC0415
+
+    from traditional_test.saliency import (  # noqa: PLC0415
+        build_embedding_model,
+        global_saliency_vector,
+    )
+
+    tokenizer = tok["tokenizer"]
+    X_train, X_val, X_test = tok["X_train"], tok["X_val"], tok["X_test"]
+    y_train = split["train"][LABEL_COL].values
+    class_weight = balanced_class_weight(y_train)
+    eval_idx = np.random.RandomState(cfg["seed"]).choice(
+        len(X_val), min(cfg["num_eval"], len(X_val)), replace=False
+    )
+
+    accuracies, vectors = [], []
+    for s in range(cfg["num_seeds"]):
+        tf.keras.utils.set_random_seed(cfg["seed"] + s)
+
+        inputs = layers.Input(shape=(X_train.shape[1],), name="input_ids")
+        x = layers.Embedding(tokenizer.num_words, cfg["emb_dim"], name="embedding")(
+            inputs
+        )
+        x = layers.Conv1D(128, 5, activation="relu")(x)
+        x = layers.GlobalMaxPooling1D()(x)
+        x = layers.Dense(64, activation="relu")(x)
+        x = layers.Dropout(0.5)(x)
+        model = models.Model(inputs, layers.Dense(1, activation="sigmoid")(x))
+        model.compile(
+            loss="binary_crossentropy", optimizer="adam", metrics=["accuracy"]
+        )
+
+        model.fit(
+            X_train,
+            y_train,
+            epochs=cfg["epochs"],
+            batch_size=cfg["batch_size"],
+            class_weight=class_weight,
+            verbose=0,
+        )
+        accuracies.append(
+            float(model.evaluate(X_test, split["test"][LABEL_COL].values, verbose=0)[1])
+        )
+        vectors.append(
+            global_saliency_vector(
+                build_embedding_model(model), X_val, eval_idx, tokenizer
+            )
+        )
+
+    corrs = [
+        spearman_between_dicts(vectors[i], vectors[j])
+        for i in range(len(vectors))
+        for j in range(i + 1, len(vectors))
+    ]
+
+    return {
+        "test_accuracy": accuracies,
+        "token_saliency": vectors,
+        "cnn_stability": float(np.mean(corrs)) if corrs else None,
+    }
+
+
+STAGES: Dict[str, Stage] = {
+    stage.name: stage
+    for stage in [
+        Stage(
+            "split",
+            (),
+            run_split,
+            lambda out: {name: len(df) for name, df in out.items()},
+        ),
+        Stage(
+            "vectorize",
+            ("split",),
+            run_vectorize,
+            lambda out: {"vocab_size": len(out["feature_names"])},
+            features=("X_train", "X_val", "X_test", "C_train"),
+        ),
+        Stage("fit", ("split", "vectorize"), run_fit, lambda out: out["metrics"]),
+        Stage(
+            "shap",
+            ("vectorize", "fit"),
+            run_shap,
+            lambda out: {
+                "top_features": out["top_features"].to_dict(),
+                "bottom_features": out["bottom_features"].to_dict(),
+            },
+            requires=("shap",),
+        ),
+        Stage(
+            "lime",
+            ("split", "vectorize", "fit"),
+            run_lime,
+            lambda out: {"weights": out["weights"]},
+            requires=("lime",),
+        ),
+        Stage("masking", ("split", "vectorize", "fit"), run_masking),
+        Stage("stability", ("split", "vectorize", "fit"), run_stability),
+        Stage(
+            "tokenize",
+            ("split",),
+            run_tokenize,
+            lambda out: {"vocab_size": out["tokenizer"].num_words},
+            features=("X_train", "X_val", "X_test"),
+            requires=("tensorflow",),
+        ),
+        Stage(
+            "saliency",
+            ("split", "tokenize"),
+            run_saliency,
+            lambda out: {
+                "test_accuracy": out["test_accuracy"],
+                "cnn_stability": out["cnn_stability"],
+            },
+            requires=("tensorflow",),
+        ),
+    ]
+}
+
+
+class ExperimentRunner:
+    """
+    Resolve, cache and run pipeline stages.
+
+    A stage's key hashes its name, its config and the keys of its
+    dependencies (the root stage hashes the input file instead), so a
+    config change invalidates exactly that stage and everything downstream.
+    """
+
+    def __init__(
+        self,
+        data_path: Union[str, Path] = DATA_PATH,
+        cache_dir: Union[str, Path] = CACHE_DIR,
+        config: Optional[Dict[str, Dict[str, Any]]] = None,
+        force: Sequence[str] = (),
+    ) -> None:
+        self.data_path = str(data_path)
+        self.cache_dir = Path(cache_dir)
+        self.config = {name: dict(cfg) for name, cfg in DEFAULT_CONFIG.items()}
+        for name, overrides in (config or {}).items():
+            self.config[name].update(overrides)
+        self.force = set(force)
+        self.log: List[Dict[str, Any]] = []
+        self._keys: Dict[str, str] = {}
+        self._outputs: Dict[str, Any] = {}
+
+    def stage_key(self, name: str) -> str:
+        """Return the content-addressed cache key of a stage."""
+        if name not in self._keys:
+            stage = STAGES[name]
+            upstream = (
+                {dep: self.stage_key(dep) for dep in stage.deps}
+                if stage.deps
+                else {"data": file_hash(self.data_path)}
+            )
+            payload = json.dumps(
+                {"stage": name, "config": self.config[name], "upstream": upstream},
+                sort_keys=True,
+            )
+            self._keys[name] = hashlib.sha256(payload.encode()).hexdigest()
+        return self._keys[name]
+
+    def artifact_path(self, name: str) -> Path:
+        """Return where a stage's output is cached."""
+        return self.cache_dir / name / f"{self.stage_key(name)}.joblib"
+
+    def run(self, name: str) -> Any:
+        """Return a stage's output, computing it and its dependencies if needed."""
+        if name in self._outputs:
+            return self._outputs[name]
+
+        stage = STAGES[name]
+        path = self.artifact_path(name)
+
+        if path.exists() and name not in self.force:
+            output = self._load(name, path)
+            self.log.append({"stage": name, "status": "cached", "key": path.stem})
+        else:
+            inputs = [self.run(dep) for dep in stage.deps] or [self.data_path]
+            start = time.perf_counter()
+            output = stage.run(self.config[name], *inputs)
+            elapsed = time.perf_counter() - start
+            output = self._store(name, path, output)
+            self.log.append(
+                {
+                    "stage": name,
+                    "status": "computed",
+                    "key": path.stem,
+                    "seconds": round(elapsed, 3),
+                }
+            )
+
+        self._outputs[name] = output
+        return output
+
+    def _load(self, name: str, path: Path) -> Any:
+        output = joblib.load(path)
+        features = STAGES[name].features
+        if features:
+            store = FeatureStore(path.with_suffix(".features"))
+            output.update({k: store.load(k) for k in features})
+        return output
+
+    def _store(self, name: str, path: Path, output: Any) -> Any:
+        """Persist a stage output and return it as later runs will load it."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        features = STAGES[name].features
+        if features:
+            store = FeatureStore(path.with_suffix(".features"))
+            for k in features:
+                store.save(k, output[k])
+            output = {k: v for k, v in output.items() if k not in features}
+
+        # The joblib artifact is written last and marks the stage as complete.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(output, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        return self._load(name, path)
+
+
+def check_requirements(names: Sequence[str]) -> None:
+    """
+    Raise ImportError naming any missing package the selected stages need.
+
+    Dependencies of the stages in names are checked too. Run before any
+    stage so a missing optional package such as ``shap`` or ``tensorflow``
+    fails at once instead of after the upstream stages.
+    """
+    missing: Dict[str, List[str]] = {}
+    seen: Set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        pending.extend(STAGES[name].deps)
+        for package in STAGES[name].requires:
+            if find_spec(package) is None:
+                missing.setdefault(package, []).append(name)
+
+    if missing:
+        details = "; ".join(
+            f"{package} (needed by {', '.join(sorted(stages))})"
+            for package, stages in sorted(missing.items())
+        )
+        raise ImportError(
+            f"Missing packages for the selected stages: {details}. "
+            "Install them or choose other --stages."
+        )
+
+
+def parse_overrides(items: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Parse ``stage.key=value`` overrides; values are read as JSON when possible."""
+    overrides: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        target, _, raw = item.partition("=")
+        stage, _, key = target.partition(".")
+        if stage not in DEFAULT_CONFIG or key not in DEFAULT_CONFIG[stage]:
+            raise ValueError(f"Unknown config key: {target}")
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            value = raw
+        overrides.setdefault(stage, {})[key] = value
+    return overrides
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the traditional XAI experiment headlessly with caching."
+    )
+    parser.add_argument(
+        "--data", type=str, default=DATA_PATH, help="Path to data_job_posts.csv."
+    )
+    parser.add_argument(
+        "--cache-dir", type=str, default=CACHE_DIR, help="Stage cache directory."
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=list(STAGES),
+        default=list(STAGES),
+        help="Stages to run (dependencies are resolved automatically).",
+    )
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        default=[],
+        metavar="STAGE.KEY=VALUE",
+        help="Override a stage config value, e.g. lime.index=5.",
+    )
+    parser.add_argument(
+        "--force",
+        nargs="*",
+        choices=list(STAGES),
+        default=[],
+        help="Recompute these stages even if cached.",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write a JSON report here."
+    )
+    args = parser.parse_args()
+
+    try:
+        check_requirements(args.stages)
+    except ImportError as e:
+        parser.error(str(e))
+
+    runner = ExperimentRunner(
+        args.data, args.cache_dir, parse_overrides(args.overrides), args.force
+    )
+    report = {name: STAGES[name].summarize(runner.run(name)) for name in args.stages}
+
+    for entry in runner.log:
+        print(f"[{entry['status']}] {entry['stage']} ({entry['key'][:12]})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"stages": runner.log, "results": report}, f, indent=2)
+        print(f"Report saved to: {args.output}")
+    else:
+        print(json.dumps(report, indent=2, default=str))
@@ -0,0 +1,253 @@
+"""Offline throughput and memory benchmarks for ingestion, evaluation and SHAP.
+
+Runs on synthetic traces from ``synthetic_traces`` with a stub Docent client,
+so no network access or API key is needed. Results are written as JSON and
+can be compared across commits.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from docent.data_models import AgentRun
+
+from uxai_docent import ingest_docent_assistant, ingest_docent_taubench
+from uxai_docent.evaluation_metrics import evaluate_rubric, normalize_values
+from uxai_docent.synthetic_traces import (
+    RUBRIC_COLUMNS,
+    generate_encoded_table,
+    generate_rubric_table,
+    generate_trace,
+)
+
+
+DEFAULT_PARAMS: Dict[str, Any] = {
+    "num_tasks": 100,
+    "spans_per_task": 20,
+    "message_words": 50,
+    "ui_dump_fraction": 0.5,
+    "error_rate": 0.1,
+    "repeat_call_rate": 0.1,
+    "repeat_error_rate": 0.5,
+    "rubric_rows": 100_000,
+    "shap_rows": 10_000,
+    "seed": 0,
+}
+
+CASES = (
+    "ingest_taubench",
+    "ingest_assistantbench",
+    "evaluate_rubric",
+    "shap_per_run",
+    "shap_global",
+)
+SHAP_CASES = ("shap_per_run", "shap_global")
+
+
+class StubDocent:
+    """Offline stand-in for ``docent.Docent`` that only counts uploads."""
+
+    def __init__(self, api_key: Optional[str] = None) -> None:
+        self.api_key = api_key
+        self.collections: Dict[str, int] = {}
+
+    def create_collection(self, name: str, description: str = "") -> str:
+        """Register a collection and return its id."""
+        collection_id = f"stub-{len(self.collections)}"
+        self.collections[collection_id] = 0
+        return collection_id
+
+    def add_agent_runs(self, collection_id: str, agent_runs: List[AgentRun]) -> None:
+        """Record the number of runs uploaded to a collection."""
+        self.collections[collection_id] += len(agent_runs)
+
+
+def measure(fn: Callable[[], int], repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time fn over repeat calls and trace its peak Python allocation once.
+
+    fn returns the number of items it processed. Memory is measured on a
+    separate call because ``tracemalloc`` slows allocation-heavy code.
+    """
+    times = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "items": items,
+        "wall_s_min": round(best, 6),
+        "wall_s_median": round(statistics.median(times), 6),
+        "items_per_s": round(items / best, 2) if best > 0 else None,
+        "peak_mem_mb": round(peak / 2**20, 3),
+    }
+
+
+def _ingest_case(benchmark: str, params: Dict[str, Any]) -> Callable[[], int]:
+    raw = json.dumps(
+        generate_trace(
+            benchmark,
+            num_tasks=params["num_tasks"],
+            spans_per_task=params["spans_per_task"],
+            message_words=params["message_words"],
+            ui_dump_fraction=params["ui_dump_fraction"],
+            error_rate=params["error_rate"],
+            repeat_call_rate=params["repeat_call_rate"],
+            repeat_error_rate=params["repeat_error_rate"],
+            seed=params["seed"],
+        )
+    )
+    module = (
+        ingest_docent_taubench if benchmark == "taubench" else ingest_docent_assistant
+    )
+
+    def run() -> int:
+        client = StubDocent()
+        collection_id = client.create_collection(name=f"bench-{benchmark}")
+        agent_runs = module.load_hal_weave_runs(json.loads(raw))
+        client.add_agent_runs(collection_id, agent_runs)
+        return sum(len(t.messages) for r in agent_runs for t in r.transcripts)
+
+    return run
+
+
+def _evaluate_case(params: Dict[str, Any]) -> Callable[[], int]:
+    table = generate_rubric_table(params["rubric_rows"], seed=params["seed"])
+
+    def run() -> int:
+        df = normalize_values(table.copy())
+        for rubric in RUBRIC_COLUMNS:
+            evaluate_rubric(df, rubric)
+        return len(df) * len(RUBRIC_COLUMNS)
+
+    return run
+
+
+def _shap_cases(params: Dict[str, Any]) -> Dict[str, Callable[[], int]]:
+    # Imported lazily: shap is only needed for these cases.
+    from uxai_docent.logistic_regression import per_run_shap  # noqa: PLC0415
+    from uxai_docent.shap_global import global_ranking  # noqa: PLC0415
+
+    encoded = generate_encoded_table(params["shap_rows"], seed=params["seed"])
+    shap_df = per_run_shap(encoded)
+
+    def fit() -> int:
+        return len(per_run_shap(encoded))
+
+    def rank() -> int:
+        global_ranking(shap_df)
+        return len(shap_df)
+
+    return {"shap_per_run": fit, "shap_global": rank}
+
+
+def available_cases(cases: Sequence[str] = CASES) -> List[str]:
+    """Return the cases that can run here; the SHAP cases need ``shap``."""
+    if find_spec("shap") is not None:
+        return list(cases)
+    return [case for case in cases if case not in SHAP_CASES]
+
+
+def git_commit() -> Optional[str]:
+    """Return the current git commit hash, or None outside a repository."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_benchmarks(
+    params: Optional[Dict[str, Any]] = None,
+    cases: Sequence[str] = CASES,
+    repeat: int = 3,
+) -> Dict[str, Any]:
+    """
+    Run the selected benchmark cases and return a JSON-serialisable report.
+
+    Cases whose optional packages are missing (see ``available_cases``) are
+    skipped and listed under ``skipped`` in the report.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+
+    runnable = available_cases(cases)
+    skipped = [case for case in cases if case not in runnable]
+    if skipped:
+        print(f"Skipping {skipped}: shap is not installed")
+
+    builders: Dict[str, Callable[[], Callable[[], int]]] = {
+        "ingest_taubench": lambda: _ingest_case("taubench", params),
+        "ingest_assistantbench": lambda: _ingest_case("assistantbench", params),
+        "evaluate_rubric": lambda: _evaluate_case(params),
+    }
+    shap_cases: Dict[str, Callable[[], int]] = {}
+
+    results = {}
+    for case in runnable:
+        if case in SHAP_CASES:
+            shap_cases = shap_cases or _shap_cases(params)
+            fn = shap_cases[case]
+        else:
+            fn = builders[case]()
+        results[case] = measure(fn, repeat=repeat)
+        print(f"{case}: {results[case]}")
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "params": params,
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark ingestion, rubric evaluation and SHAP offline"
+    )
+    parser.add_argument("--output", required=True, help="Path to the results JSON")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    for name, default in DEFAULT_PARAMS.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(default), default=default
+        )
+
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        {name: getattr(args, name) for name in DEFAULT_PARAMS},
+        cases=args.cases,
+        repeat=args.repeat,
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Benchmark results saved to: {args.output}")
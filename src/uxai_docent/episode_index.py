@@ -0,0 +1,292 @@
+"""On-disk inverted index over ingested episodes for fast trajectory queries.
+
+Terms are ``field:value`` strings:
+
+- ``tool:<name>``  tool name of a call/response (or AssistantBench action)
+- ``kind:<kind>``  call, response, error, exception, assistant or input
+- ``op:<op_name>`` Weave op that produced the message
+- ``tok:<token>``  lowercase word token of the message content
+
+Each term maps to a sorted int64 postings array of message keys
+``run << 32 | position``. Postings are stored concatenated in one ``.npy``
+file and memory-mapped on load, so queries never re-parse the traces.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from docent.data_models import AgentRun
+
+from uxai_docent.trajectory_features import episode_table
+
+
+FIELDS = {"tool": "tool_name", "kind": "kind", "op": "op_name"}
+
+_POSITION_BITS = 32
+_POSITION_MASK = (1 << _POSITION_BITS) - 1
+_TOKEN_RE = re.compile(r"\w+")
+
+Terms = Union[str, Sequence[str]]
+
+
+def encode_keys(runs: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Pack (run, position) pairs into sortable int64 message keys."""
+    return (np.asarray(runs, dtype=np.int64) << _POSITION_BITS) | np.asarray(
+        positions, dtype=np.int64
+    )
+
+
+def decode_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unpack message keys into (run, position) arrays."""
+    keys = np.asarray(keys, dtype=np.int64)
+    return keys >> _POSITION_BITS, keys & _POSITION_MASK
+
+
+def _term_postings(episodes: pd.DataFrame) -> pd.DataFrame:
+    """Return the distinct (term, key) pairs of an episode table."""
+    keys = encode_keys(episodes["run"].to_numpy(), episodes["position"].to_numpy())
+    frames = [
+        pd.DataFrame({"term": field + ":" + episodes[col].astype(str), "key": keys})[
+            episodes[col].notna().to_numpy()
+        ]
+        for field, col in FIELDS.items()
+    ]
+
+    tokens = pd.Series(
+        [sorted(set(_TOKEN_RE.findall(text.lower()))) for text in episodes["content"]],
+        index=episodes.index,
+    )
+    exploded = pd.DataFrame({"token": tokens, "key": keys}).explode("token").dropna()
+    frames.append(
+        pd.DataFrame({"term": "tok:" + exploded["token"], "key": exploded["key"]})
+    )
+
+    return pd.concat(frames, ignore_index=True).drop_duplicates()
+
+
+class EpisodeIndex:
+    """Inverted index from trajectory terms to (task_id, message position)."""
+
+    def __init__(
+        self,
+        terms: Dict[str, Tuple[int, int]],
+        postings: np.ndarray,
+        task_ids: List[str],
+    ) -> None:
+        self.terms = terms
+        self.postings = postings
+        self.task_ids = task_ids
+
+    @classmethod
+    def from_episodes(cls, episodes: pd.DataFrame) -> "EpisodeIndex":
+        """Build the index from an ``episode_table`` DataFrame."""
+        pairs = _term_postings(episodes)
+        codes, vocab = pd.factorize(pairs["term"], sort=True)
+        keys = pairs["key"].to_numpy(dtype=np.int64)
+
+        order = np.lexsort((keys, codes))
+        bounds = np.concatenate(
+            [[0], np.cumsum(np.bincount(codes, minlength=len(vocab)))]
+        )
+        terms = {
+            str(term): (int(bounds[i]), int(bounds[i + 1]))
+            for i, term in enumerate(vocab)
+        }
+
+        num_runs = int(episodes["run"].max()) + 1 if len(episodes) else 0
+        task_ids = episodes.groupby("run")["task_id"].first().reindex(range(num_runs))
+        return cls(terms, keys[order], task_ids.fillna("").astype(str).tolist())
+
+    @classmethod
+    def from_runs(cls, runs: List[AgentRun]) -> "EpisodeIndex":
+        """Build the index from AgentRuns returned by ``load_hal_weave_runs``."""
+        return cls.from_episodes(episode_table(runs))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the index to a directory, replacing any existing index."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}."))
+
+        try:
+            np.save(tmp / "postings.npy", self.postings)
+            (tmp / "terms.json").write_text(json.dumps(self.terms))
+            (tmp / "tasks.json").write_text(json.dumps(self.task_ids))
+
+            if path.exists():
+                shutil.rmtree(path)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "EpisodeIndex":
+        """Open an index directory, memory-mapping the postings unless mmap is False."""
+        path = Path(path)
+        if not (path / "terms.json").exists():
+            raise FileNotFoundError(f"Episode index not found: {path}")
+
+        terms = {
+            term: (start, stop)
+            for term, (start, stop) in json.loads(
+                (path / "terms.json").read_text()
+            ).items()
+        }
+        postings = np.load(path / "postings.npy", mmap_mode="r" if mmap else None)
+        if mmap and postings.size == 0:
+            # Zero-length arrays cannot be mapped; fall back to a regular load.
+            postings = np.load(path / "postings.npy")
+        task_ids = json.loads((path / "tasks.json").read_text())
+        return cls(terms, postings, task_ids)
+
+    def frequency(self, term: str) -> int:
+        """Return the number of messages containing term."""
+        start, stop = self.terms.get(term, (0, 0))
+        return stop - start
+
+    def keys(self, term: str) -> np.ndarray:
+        """Return the sorted message keys of a term (empty if unknown)."""
+        start, stop = self.terms.get(term, (0, 0))
+        return np.asarray(self.postings[start:stop])
+
+    def message_keys(self, terms: Terms) -> np.ndarray:
+        """Return keys of messages matching every term in terms."""
+        terms = [terms] if isinstance(terms, str) else list(terms)
+        if not terms:
+            raise ValueError("At least one term is required.")
+
+        # Intersect from the rarest term so intermediate results stay small.
+        ordered = sorted(terms, key=self.frequency)
+        result = self.keys(ordered[0])
+        for term in ordered[1:]:
+            result = np.intersect1d(result, self.keys(term), assume_unique=True)
+        return result
+
+    def _runs(self, terms: Terms) -> np.ndarray:
+        return np.unique(decode_keys(self.message_keys(terms))[0])
+
+    def _hits(self, keys: np.ndarray) -> pd.DataFrame:
+        runs, positions = decode_keys(keys)
+        return pd.DataFrame(
+            {
+                "task_id": np.asarray(self.task_ids, dtype=object)[runs],
+                "position": positions,
+            }
+        )
+
+    def messages(self, terms: Terms) -> pd.DataFrame:
+        """Return (task_id, position) of messages matching every term."""
+        return self._hits(self.message_keys(terms))
+
+    def match(
+        self,
+        all_of: Sequence[Terms] = (),
+        any_of: Sequence[Terms] = (),
+        none_of: Sequence[Terms] = (),
+    ) -> List[str]:
+        """
+        Return task_ids of runs satisfying a boolean query.
+
+        Each clause item is a term or a list of terms that must hold on the
+        same message, e.g. ``all_of=[["tool:book", "kind:error"]]`` finds runs
+        where ``book`` returned an error. Runs must satisfy every ``all_of``
+        item, at least one ``any_of`` item (if given) and no ``none_of`` item.
+        """
+        runs = np.arange(len(self.task_ids))
+        for clause in all_of:
+            runs = np.intersect1d(runs, self._runs(clause), assume_unique=True)
+        if any_of:
+            runs = np.intersect1d(
+                runs, np.unique(np.concatenate([self._runs(c) for c in any_of]))
+            )
+        for clause in none_of:
+            runs = np.setdiff1d(runs, self._runs(clause), assume_unique=True)
+
+        return [self.task_ids[r] for r in runs]
+
+    def sequence(
+        self, first: Terms, then: Terms, *, within: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Find messages matching first that are later followed by then.
+
+        For every first-message, the nearest following then-message in the
+        same run is reported if it lies at most within positions later.
+        Returns task_id, first_position and then_position.
+        """
+        a = self.message_keys(first)
+        b = self.message_keys(then)
+
+        nxt = np.searchsorted(b, a + 1)
+        found = nxt < len(b)
+        a, b_next = a[found], b[nxt[found]]
+
+        a_run, a_pos = decode_keys(a)
+        b_run, b_pos = decode_keys(b_next)
+        keep = a_run == b_run
+        if within is not None:
+            keep &= (b_pos - a_pos) <= within
+
+        hits = self._hits(a[keep]).rename(columns={"position": "first_position"})
+        hits["then_position"] = b_pos[keep]
+        return hits
+
+
+def _parse_clauses(clauses: List[str]) -> List[List[str]]:
+    """Split CLI clauses like ``tool:book+kind:error`` into same-message terms."""
+    return [clause.split("+") for clause in clauses]
+
+
+def build_index(runs: List[AgentRun], path: Union[str, Path]) -> EpisodeIndex:
+    """Build an EpisodeIndex from ingested runs and save it to path."""
+    index = EpisodeIndex.from_runs(runs)
+    index.save(path)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Query an episode index built during ingestion"
+    )
+    parser.add_argument("--index-dir", required=True, help="Index directory")
+    parser.add_argument(
+        "--all",
+        nargs="+",
+        default=[],
+        help="Terms that must all hold (use a+b for terms on the same message)",
+    )
+    parser.add_argument("--any", nargs="+", default=[], help="At least one term")
+    parser.add_argument("--none", nargs="+", default=[], help="Excluded terms")
+    parser.add_argument(
+        "--sequence",
+        nargs=2,
+        metavar=("FIRST", "THEN"),
+        default=None,
+        help="Find FIRST followed by THEN (a+b joins same-message terms)",
+    )
+    parser.add_argument("--within", type=int, default=None)
+
+    args = parser.parse_args()
+    index = EpisodeIndex.load(args.index_dir)
+
+    if args.sequence:
+        first, then = _parse_clauses(args.sequence)
+        print(index.sequence(first, then, within=args.within).to_string(index=False))
+    else:
+        task_ids = index.match(
+            _parse_clauses(args.all),
+            _parse_clauses(args.any),
+            _parse_clauses(args.none),
+        )
+        print(f"{len(task_ids)} matching runs")
+        for task_id in task_ids:
+            print(task_id)
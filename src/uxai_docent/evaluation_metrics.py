@@ -1,11 +1,13 @@
 """Evaluation Metrics for Docent Rubrics."""
 
-import sys
+import argparse
 from pathlib import Path
-from typing import Dict, Tuple, Union, cast
+from typing import Dict, Optional, Tuple, Union, cast
 
 import pandas as pd
 
+from uxai_docent.instrumentation import Instrumentation, add_instrumentation_args
+
 
 def load_table(path: Union[str, Path]) -> pd.DataFrame:
     """Load a CSV or XLSX file into a pandas DataFrame."""
@@ -135,10 +137,16 @@ def evaluate_rubric(
     return cont, fm, rel
 
 
-def main(path: str) -> None:
+def main(path: str, instrumentation: Optional[Instrumentation] = None) -> None:
     """Load data and evaluate metrics for each rubric."""
-    df = load_table(path)
-    df = normalize_values(df)
+    instrumentation = instrumentation or Instrumentation()
+
+    with instrumentation.stage("load_table") as stage:
+        df = load_table(path)
+        stage.items = len(df)
+
+    with instrumentation.stage("normalize_values", items=len(df)):
+        df = normalize_values(df)
 
     rubrics = [
         "intent alignment - task (flag (match/no match))",
@@ -158,7 +166,8 @@ def main(path: str) -> None:
 
         print(f"\n--- Rubric: {rubric.upper()} ---\n")
 
-        cont, fm, rel = evaluate_rubric(df, rubric)
+        with instrumentation.stage(f"evaluate_rubric[{rubric}]", items=len(df)):
+            cont, fm, rel = evaluate_rubric(df, rubric)
 
         print("Contingency Table:")
         print(cont, "\n")
@@ -179,8 +188,13 @@ def main(path: str) -> None:
 
 if __name__ == "__main__":
     """Entry point for command-line execution."""
-    if len(sys.argv) != 2:
-        print("Usage: python evaluation_metrics.py <input.csv|input.xlsx>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Evaluate rubric metrics against task outcomes."
+    )
+    parser.add_argument("path", help="Path to the input CSV or XLSX file.")
+    add_instrumentation_args(parser)
+    args = parser.parse_args()
 
-    main(sys.argv[1])
+    instrumentation = Instrumentation.from_args(args, script="evaluation_metrics")
+    main(args.path, instrumentation)
+    instrumentation.close()
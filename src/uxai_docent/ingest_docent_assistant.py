@@ -4,11 +4,14 @@ import argparse
 import json
 import os
 from collections import defaultdict
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from docent import Docent
 from docent.data_models import AgentRun, Transcript
-from docent.data_models.chat import parse_chat_message
+from docent.data_models.chat import ChatMessage, parse_chat_message
+
+from uxai_docent.episode_index import build_index
+from uxai_docent.instrumentation import Instrumentation, add_instrumentation_args
 
 
 TRACE_PATH = (
@@ -84,7 +87,61 @@ def extract_assistant_payload(msg: Dict[str, Any]) -> str:
     return "\n\n".join(parts).strip()
 
 
-def load_hal_weave_runs(data: Dict[str, Any]) -> List[AgentRun]:  # noqa: PLR0912, PLR0915
+def build_task_messages(
+    task_spans: List[Dict[str, Any]],
+    parse: Callable[[Dict[str, Any]], ChatMessage] = parse_chat_message,
+) -> List[ChatMessage]:
+    """
+    Build the deduplicated message list of one task from its sorted spans.
+
+    parse turns each message dict into a Docent ChatMessage; the loader passes
+    an instrumented ``parse_chat_message`` when timing is enabled.
+    """
+    seen: Set[Tuple[Any, ...]] = set()
+    messages = []
+
+    for span in task_spans:
+        inputs = span.get("inputs", {})
+
+        raw_messages = inputs.get("messages", [])
+        if isinstance(raw_messages, list):
+            for msg in raw_messages:
+                if not isinstance(msg, dict):
+                    continue
+
+                if not is_real_user_or_system_message(msg):
+                    continue
+
+                role = msg["role"]
+                content = safe_str(msg["content"])
+                key: Tuple[Any, ...] = (role, content)
+
+                if key not in seen:
+                    seen.add(key)
+                    messages.append(parse({"role": role, "content": content}))
+
+        raw_ai = inputs.get("raw")
+        if isinstance(raw_ai, dict) and raw_ai.get("_type") == "AIMessage":
+            content = extract_assistant_payload(raw_ai)
+            # Identical actions issued on different turns are kept; only the
+            # same turn (same tool-call ids) logged by several spans is not.
+            call_ids = tuple(
+                call.get("id")
+                for call in raw_ai.get("tool_calls") or []
+                if isinstance(call, dict) and call.get("id")
+            )
+            key = ("assistant", call_ids or content)
+
+            if content and key not in seen:
+                seen.add(key)
+                messages.append(parse({"role": "assistant", "content": content}))
+
+    return messages
+
+
+def load_hal_weave_runs(
+    data: Dict[str, Any], instrumentation: Optional[Instrumentation] = None
+) -> List[AgentRun]:
     """
     Build ONE AgentRun per AssistantBench task (episode).
 
@@ -94,58 +151,29 @@ def load_hal_weave_runs(data: Dict[str, Any]) -> List[AgentRun]:  # noqa: PLR091
     - Use inputs.raw AIMessage as the authoritative assistant turn
     - Drop browser UI dumps & screenshots
     """
+    instrumentation = instrumentation or Instrumentation()
+    build_messages = instrumentation.timed("build_messages", build_task_messages)
+    parse = instrumentation.timed("parse_chat_message", parse_chat_message)
+
     config = data.get("config", {})
     benchmark_name = config.get("benchmark_name", "assistantbench")
     agent_name = config.get("agent_name", "unknown_agent")
 
     spans = data.get("raw_logging_results", [])
 
-    spans_by_task: Dict[str, List[dict]] = defaultdict(list)
-    for span in spans:
-        task_id = span.get("weave_task_id")
-        if task_id:
-            spans_by_task[str(task_id)].append(span)
+    with instrumentation.stage("group_spans", items=len(spans)):
+        spans_by_task: Dict[str, List[dict]] = defaultdict(list)
+        for span in spans:
+            task_id = span.get("weave_task_id")
+            if task_id:
+                spans_by_task[str(task_id)].append(span)
 
     agent_runs: List[AgentRun] = []
 
     for task_id, task_spans in spans_by_task.items():
         task_spans.sort(key=lambda s: s.get("started_at", ""))
 
-        seen = set()
-        messages = []
-
-        for span in task_spans:
-            inputs = span.get("inputs", {})
-
-            raw_messages = inputs.get("messages", [])
-            if isinstance(raw_messages, list):
-                for msg in raw_messages:
-                    if not isinstance(msg, dict):
-                        continue
-
-                    if not is_real_user_or_system_message(msg):
-                        continue
-
-                    role = msg["role"]
-                    content = safe_str(msg["content"])
-                    key = (role, content)
-
-                    if key not in seen:
-                        seen.add(key)
-                        messages.append(
-                            parse_chat_message({"role": role, "content": content})
-                        )
-
-            raw_ai = inputs.get("raw")
-            if isinstance(raw_ai, dict) and raw_ai.get("_type") == "AIMessage":
-                content = extract_assistant_payload(raw_ai)
-                key = ("assistant", content)
-
-                if content and key not in seen:
-                    seen.add(key)
-                    messages.append(
-                        parse_chat_message({"role": "assistant", "content": content})
-                    )
+        messages = build_messages(task_spans, parse)
 
         if not messages:
             continue
@@ -181,27 +209,45 @@ if __name__ == "__main__":
     parser.add_argument(
         "--trace-path", type=str, default=TRACE_PATH, help="Path to the trace JSON file"
     )
+    parser.add_argument(
+        "--index-dir",
+        type=str,
+        default=None,
+        help="Optional directory to write an episode index for trajectory queries",
+    )
+    add_instrumentation_args(parser)
 
     args = parser.parse_args()
+    instrumentation = Instrumentation.from_args(args, script="ingest_docent_assistant")
 
-    with open(args.trace_path, "r") as f:
+    with instrumentation.stage("json_load") as stage, open(args.trace_path, "r") as f:
         log = json.load(f)
+        stage.items = len(log.get("raw_logging_results", []))
 
     client = Docent(api_key=os.getenv("DOCENT_API_KEY"))
 
-    collection_id = client.create_collection(
-        name="HAL AssistantBench (Clean Episodes)",
-        description=(
-            "AssistantBench agent runs with UI dumps removed. "
-            "One AgentRun per task. Tool calls and done() preserved."
-        ),
-    )
+    with instrumentation.stage("create_collection"):
+        collection_id = client.create_collection(
+            name="HAL AssistantBench (Clean Episodes)",
+            description=(
+                "AssistantBench agent runs with UI dumps removed. "
+                "One AgentRun per task. Tool calls and done() preserved."
+            ),
+        )
 
     print(f"Created collection: {collection_id}")
 
-    agent_runs = load_hal_weave_runs(log)
+    with instrumentation.stage("load_hal_weave_runs"):
+        agent_runs = load_hal_weave_runs(log, instrumentation)
     print(f"Ingesting {len(agent_runs)} agent runs...")
 
-    client.add_agent_runs(collection_id, agent_runs)
+    if args.index_dir:
+        with instrumentation.stage("build_index", items=len(agent_runs)):
+            build_index(agent_runs, args.index_dir)
+        print(f"Wrote episode index to {args.index_dir}")
+
+    with instrumentation.stage("upload", items=len(agent_runs)):
+        client.add_agent_runs(collection_id, agent_runs)
 
     print("✅ Ingestion complete")
+    instrumentation.close()
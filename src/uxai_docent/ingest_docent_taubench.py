@@ -4,11 +4,14 @@ import argparse
 import json
 import os
 from collections import defaultdict
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from docent import Docent
 from docent.data_models import AgentRun, Transcript
-from docent.data_models.chat import parse_chat_message
+from docent.data_models.chat import ChatMessage, parse_chat_message
+
+from uxai_docent.episode_index import build_index
+from uxai_docent.instrumentation import Instrumentation, add_instrumentation_args
 
 
 TRACE_PATH = "./data/Traces/Taubenchairline/Taubenchairline/taubench_airline_1743994890_UPLOAD.json"
@@ -23,151 +26,185 @@ def safe_content(value: Any) -> str:
     return str(value)
 
 
-# TODO: Refactor to reduce complexity
-def load_hal_weave_runs(data: Dict[str, Any]) -> List[AgentRun]:  # noqa: PLR0912, PLR0915
+def build_task_messages(
+    task_spans: List[Dict[str, Any]],
+    parse: Callable[[Dict[str, Any]], ChatMessage] = parse_chat_message,
+) -> List[ChatMessage]:
     """
-    Load HAL TAU-bench runs from Weave trace data.
-
-    Build ONE AgentRun per weave_task_id (episode-level),
-    including:
-      - user / system messages
-      - assistant messages
-      - tool calls
-      - tool responses
-      - tool errors
-      - span-level exceptions
-    """
-    config = data.get("config", {})
-    benchmark_name = config.get("benchmark_name", "taubench_airline")
-    agent_name = config.get("agent_name", "unknown_agent")
-
-    spans = data.get("raw_logging_results", [])
+    Build the deduplicated message list of one task from its sorted spans.
 
-    spans_by_task: Dict[str, List[dict]] = defaultdict(list)
+    Each span replays the conversation so far in ``inputs.messages``, so
+    input messages are deduplicated. Tool replies are emitted where they
+    appear in that history, i.e. before the calls in the span's output, and
+    are keyed by ``tool_call_id`` (or history position) rather than content,
+    so identical repeated errors are kept. Calls are keyed by their id, or
+    by span and call ordinal, so identical retries are kept too.
 
-    for span in spans:
-        task_id = span.get("weave_task_id")
-        if task_id is not None:
-            spans_by_task[str(task_id)].append(span)
-
-    agent_runs: List[AgentRun] = []
-    for task_id, task_spans in spans_by_task.items():
-        task_spans.sort(key=lambda s: (s.get("started_at", ""), s.get("ended_at", "")))
+    parse turns each message dict into a Docent ChatMessage; the loader passes
+    an instrumented ``parse_chat_message`` when timing is enabled.
+    """
+    messages = []
+    seen: Set[Tuple[Any, ...]] = set()
 
-        messages = []
-        seen = set()
+    for span_idx, span in enumerate(task_spans):
+        inputs = span.get("inputs", {})
+        output = span.get("output", {})
 
-        for span in task_spans:
-            inputs = span.get("inputs", {})
-            output = span.get("output", {})
+        for msg_idx, msg in enumerate(inputs.get("messages", [])):
+            role = msg.get("role", "user")
+            content = safe_content(msg.get("content"))
 
-            for msg in inputs.get("messages", []):
-                role = msg.get("role", "user")
-                content = safe_content(msg.get("content"))
-                key = (role, content)
+            if role == "tool":
+                is_error = content.lower().startswith("error")
+                key: Tuple[Any, ...] = (
+                    "tool_response",
+                    msg.get("tool_call_id") or msg_idx,
+                    content,
+                )
 
                 if content.strip() and key not in seen:
                     seen.add(key)
                     messages.append(
-                        parse_chat_message(
+                        parse(
                             {
-                                "role": role,
-                                "content": content,
+                                "role": "tool",
+                                "content": (
+                                    f"[TOOL ERROR] {content}"
+                                    if is_error
+                                    else f"[TOOL RESPONSE] {content}"
+                                ),
                                 "metadata": {
-                                    "source": "input",
-                                    "op_name": span.get("op_name"),
+                                    "tool_name": msg.get("name"),
+                                    "type": "response",
+                                    "is_error": is_error,
                                 },
                             }
                         )
                     )
+                continue
+
+            key = (role, content)
+
+            if content.strip() and key not in seen:
+                seen.add(key)
+                messages.append(
+                    parse(
+                        {
+                            "role": role,
+                            "content": content,
+                            "metadata": {
+                                "source": "input",
+                                "op_name": span.get("op_name"),
+                            },
+                        }
+                    )
+                )
+
+        for choice in output.get("choices", []):
+            assistant_msg = choice.get("message", {})
+
+            content = safe_content(assistant_msg.get("content"))
+            key = ("assistant", content)
+
+            if content.strip() and key not in seen:
+                seen.add(key)
+                messages.append(
+                    parse(
+                        {
+                            "role": "assistant",
+                            "content": content,
+                            "metadata": {
+                                "source": "assistant",
+                                "op_name": span.get("op_name"),
+                            },
+                        }
+                    )
+                )
 
-            for choice in output.get("choices", []):
-                assistant_msg = choice.get("message", {})
-
-                content = safe_content(assistant_msg.get("content"))
-                key = ("assistant", content)
+            tool_calls = assistant_msg.get("tool_calls", []) or []
+            for call_idx, tool_call in enumerate(tool_calls):
+                tool_name = tool_call.get("function", {}).get("name", "")
+                tool_args = tool_call.get("function", {}).get("arguments", "")
+                call_repr = f"{tool_name}({tool_args})"
+                key = ("tool_call", tool_call.get("id") or (span_idx, call_idx))
 
-                if content.strip() and key not in seen:
+                if call_repr.strip() and key not in seen:
                     seen.add(key)
                     messages.append(
-                        parse_chat_message(
+                        parse(
                             {
-                                "role": "assistant",
-                                "content": content,
+                                "role": "tool",
+                                "content": f"[TOOL CALL] {call_repr}",
                                 "metadata": {
-                                    "source": "assistant",
-                                    "op_name": span.get("op_name"),
+                                    "tool_name": tool_name,
+                                    "type": "call",
                                 },
                             }
                         )
                     )
 
-                for tool_call in assistant_msg.get("tool_calls", []) or []:
-                    tool_name = tool_call.get("function", {}).get("name", "")
-                    tool_args = tool_call.get("function", {}).get("arguments", "")
-                    call_repr = f"{tool_name}({tool_args})"
-                    key = ("tool_call", call_repr)
-
-                    if call_repr.strip() and key not in seen:
-                        seen.add(key)
-                        messages.append(
-                            parse_chat_message(
-                                {
-                                    "role": "tool",
-                                    "content": f"[TOOL CALL] {call_repr}",
-                                    "metadata": {
-                                        "tool_name": tool_name,
-                                        "type": "call",
-                                    },
-                                }
-                            )
-                        )
+        exception = span.get("exception")
+        if exception:
+            content = safe_content(exception)
+
+            if content.strip():
+                messages.append(
+                    parse(
+                        {
+                            # Docent has no "error" role; exceptions are
+                            # tool-role messages tagged by type.
+                            "role": "tool",
+                            "content": f"[EXCEPTION] {content}",
+                            "metadata": {
+                                "source": "span_exception",
+                                "op_name": span.get("op_name"),
+                                "type": "exception",
+                            },
+                        }
+                    )
+                )
 
-            for msg in inputs.get("messages", []):
-                if msg.get("role") == "tool":
-                    content = safe_content(msg.get("content"))
-                    is_error = content.lower().startswith("error")
-                    key = ("tool_response", content)
-
-                    if content.strip() and key not in seen:
-                        seen.add(key)
-                        messages.append(
-                            parse_chat_message(
-                                {
-                                    "role": "tool",
-                                    "content": (
-                                        f"[TOOL ERROR] {content}"
-                                        if is_error
-                                        else f"[TOOL RESPONSE] {content}"
-                                    ),
-                                    "metadata": {
-                                        "tool_name": msg.get("name"),
-                                        "type": "response",
-                                        "is_error": is_error,
-                                    },
-                                }
-                            )
-                        )
+    return messages
 
-            exception = span.get("exception")
-            if exception:
-                content = safe_content(exception)
-                key = ("exception", content)
 
-                if content.strip() and key not in seen:
-                    seen.add(key)
-                    messages.append(
-                        parse_chat_message(
-                            {
-                                "role": "error",
-                                "content": f"[EXCEPTION] {content}",
-                                "metadata": {
-                                    "source": "span_exception",
-                                    "op_name": span.get("op_name"),
-                                },
-                            }
-                        )
-                    )
+def load_hal_weave_runs(
+    data: Dict[str, Any], instrumentation: Optional[Instrumentation] = None
+) -> List[AgentRun]:
+    """
+    Load HAL TAU-bench runs from Weave trace data.
+
+    Build ONE AgentRun per weave_task_id (episode-level),
+    including:
+      - user / system messages
+      - assistant messages
+      - tool calls
+      - tool responses
+      - tool errors
+      - span-level exceptions
+    """
+    instrumentation = instrumentation or Instrumentation()
+    build_messages = instrumentation.timed("build_messages", build_task_messages)
+    parse = instrumentation.timed("parse_chat_message", parse_chat_message)
+
+    config = data.get("config", {})
+    benchmark_name = config.get("benchmark_name", "taubench_airline")
+    agent_name = config.get("agent_name", "unknown_agent")
+
+    spans = data.get("raw_logging_results", [])
+
+    with instrumentation.stage("group_spans", items=len(spans)):
+        spans_by_task: Dict[str, List[dict]] = defaultdict(list)
+
+        for span in spans:
+            task_id = span.get("weave_task_id")
+            if task_id is not None:
+                spans_by_task[str(task_id)].append(span)
+
+    agent_runs: List[AgentRun] = []
+    for task_id, task_spans in spans_by_task.items():
+        task_spans.sort(key=lambda s: (s.get("started_at", ""), s.get("ended_at", "")))
+
+        messages = build_messages(task_spans, parse)
 
         if not messages:
             continue
@@ -202,24 +239,42 @@ if __name__ == "__main__":
     parser.add_argument(
         "--trace-path", type=str, default=TRACE_PATH, help="Path to the trace JSON file"
     )
+    parser.add_argument(
+        "--index-dir",
+        type=str,
+        default=None,
+        help="Optional directory to write an episode index for trajectory queries",
+    )
+    add_instrumentation_args(parser)
 
     args = parser.parse_args()
+    instrumentation = Instrumentation.from_args(args, script="ingest_docent_taubench")
 
-    with open(args.trace_path, "r") as f:
+    with instrumentation.stage("json_load") as stage, open(args.trace_path, "r") as f:
         log = json.load(f)
+        stage.items = len(log.get("raw_logging_results", []))
 
     client = Docent(api_key=os.getenv("DOCENT_API_KEY"))
 
-    collection_id = client.create_collection(
-        name="HAL TAU-bench Airline (Episode-level, with errors)",
-        description="One AgentRun per task with tools, failures, and exceptions",
-    )
+    with instrumentation.stage("create_collection"):
+        collection_id = client.create_collection(
+            name="HAL TAU-bench Airline (Episode-level, with errors)",
+            description="One AgentRun per task with tools, failures, and exceptions",
+        )
 
     print(f"Created collection: {collection_id}")
 
-    agent_runs = load_hal_weave_runs(log)
+    with instrumentation.stage("load_hal_weave_runs"):
+        agent_runs = load_hal_weave_runs(log, instrumentation)
     print(f"Ingesting {len(agent_runs)} agent runs...")
 
-    client.add_agent_runs(collection_id, agent_runs)
+    if args.index_dir:
+        with instrumentation.stage("build_index", items=len(agent_runs)):
+            build_index(agent_runs, args.index_dir)
+        print(f"Wrote episode index to {args.index_dir}")
+
+    with instrumentation.stage("upload", items=len(agent_runs)):
+        client.add_agent_runs(collection_id, agent_runs)
 
     print("✅ Ingestion complete")
+    instrumentation.close()
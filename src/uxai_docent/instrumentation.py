@@ -0,0 +1,213 @@
+"""Opt-in stage-level timing and memory instrumentation for the pipeline scripts.
+
+Scripts wrap their stages in ``instrumentation.stage(name)`` and register
+the CLI flags with ``add_instrumentation_args``. Helpers called once per item
+are wrapped with ``instrumentation.timed(name, fn)`` instead. Without
+``--stage-report`` or ``--profile-dir`` both are no-ops, so default runs
+behave as before.
+"""
+
+import argparse
+import cProfile
+import functools
+import json
+import re
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+DEFAULT_REPORT_NAME = "stage_report.json"
+
+T = TypeVar("T")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Return the process's peak resident set size in MiB, if available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@dataclass
+class StageRecord:
+    """Measurements for one executed stage."""
+
+    name: str
+    items: Optional[int] = None
+    wall_s: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    rss_growth_mb: Optional[float] = None
+
+
+class Instrumentation:
+    """
+    Collect wall time, peak RSS and item counts per named stage.
+
+    Peak RSS is the process high-water mark after the stage; ``rss_growth_mb``
+    is how much the stage raised it. With a profile_dir every top-level stage
+    runs under cProfile, and only the slowest stage's stats are dumped.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        *,
+        report_path: Optional[Union[str, Path]] = None,
+        profile_dir: Optional[Union[str, Path]] = None,
+        script: Optional[str] = None,
+    ) -> None:
+        self.enabled = enabled or report_path is not None or profile_dir is not None
+        self.report_path = Path(report_path) if report_path else None
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.script = script
+        self.records: List[StageRecord] = []
+        self._profiles: Dict[int, cProfile.Profile] = {}
+        self._profiling = False
+        self._start = time.perf_counter()
+
+    @classmethod
+    def from_args(
+        cls, args: argparse.Namespace, script: Optional[str] = None
+    ) -> "Instrumentation":
+        """Build from the flags added by ``add_instrumentation_args``."""
+        return cls(
+            report_path=args.stage_report, profile_dir=args.profile_dir, script=script
+        )
+
+    @contextmanager
+    def stage(self, name: str, items: Optional[int] = None) -> Iterator[StageRecord]:
+        """
+        Measure the enclosed block as a stage called name.
+
+        The yielded record's ``items`` can be set inside the block once the
+        count is known. Nested stages are recorded, but only the outermost
+        one is profiled.
+        """
+        record = StageRecord(name, items)
+        if not self.enabled:
+            yield record
+            return
+
+        profiler = None
+        if self.profile_dir is not None and not self._profiling:
+            profiler = cProfile.Profile()
+            self._profiling = True
+
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+            record.wall_s = time.perf_counter() - start
+            record.peak_rss_mb = peak_rss_mb()
+            if rss_before is not None and record.peak_rss_mb is not None:
+                record.rss_growth_mb = record.peak_rss_mb - rss_before
+
+            self.records.append(record)
+            if profiler is not None:
+                self._profiles[len(self.records) - 1] = profiler
+
+    def timed(self, name: str, fn: Callable[..., T]) -> Callable[..., T]:
+        """
+        Wrap fn so that every call adds to one stage called name.
+
+        The stage's ``wall_s`` accumulates the time spent inside fn and
+        ``items`` counts the calls. Peak RSS is not sampled per call. When
+        instrumentation is off, fn is returned unchanged.
+        """
+        if not self.enabled:
+            return fn
+
+        record = StageRecord(name, items=0)
+        self.records.append(record)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record.wall_s += time.perf_counter() - start
+                record.items = (record.items or 0) + 1
+
+        return wrapper
+
+    def slowest(self) -> Optional[StageRecord]:
+        """Return the stage with the longest wall time."""
+        return max(self.records, key=lambda r: r.wall_s, default=None)
+
+    def report(self) -> Dict[str, Any]:
+        """Return the machine-readable report as a dict."""
+        slowest = self.slowest()
+        return {
+            "script": self.script,
+            "argv": sys.argv,
+            "total_wall_s": time.perf_counter() - self._start,
+            "peak_rss_mb": peak_rss_mb(),
+            "slowest_stage": slowest.name if slowest else None,
+            "stages": [asdict(r) for r in self.records],
+        }
+
+    def dump_slowest_profile(self) -> Optional[Path]:
+        """Write the slowest profiled stage's cProfile stats into profile_dir."""
+        if self.profile_dir is None or not self._profiles:
+            return None
+
+        idx = max(self._profiles, key=lambda i: self.records[i].wall_s)
+        name = re.sub(r"[^\w.-]+", "_", self.records[idx].name)
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profile_dir / f"{self.script or 'stages'}.{name}.prof"
+        self._profiles[idx].dump_stats(path)
+        return path
+
+    def close(self) -> Optional[Path]:
+        """Write the report (and slowest-stage profile) if instrumentation is on."""
+        if not self.enabled:
+            return None
+
+        report = self.report()
+        profile = self.dump_slowest_profile()
+        report["profile"] = str(profile) if profile else None
+
+        path = self.report_path or Path(self.profile_dir or ".") / DEFAULT_REPORT_NAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+
+        for record in self.records:
+            items = f", {record.items} items" if record.items is not None else ""
+            print(f"[stage] {record.name}: {record.wall_s:.3f}s{items}")
+        print(f"Stage report saved to: {path}")
+        return path
+
+
+def add_instrumentation_args(parser: argparse.ArgumentParser) -> None:
+    """Register the opt-in ``--stage-report`` and ``--profile-dir`` flags."""
+    parser.add_argument(
+        "--stage-report",
+        type=str,
+        default=None,
+        help="Write per-stage wall time, peak RSS and item counts to this JSON file",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=None,
+        help="Profile stages with cProfile and dump the slowest one here",
+    )
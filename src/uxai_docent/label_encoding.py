@@ -4,11 +4,38 @@ import argparse
 
 import pandas as pd
 
+from uxai_docent.instrumentation import Instrumentation, add_instrumentation_args
+
 
 # Default Paths
 INPUT_PATH = "./data/taubench_airline.xlsx"
 OUTPUT_PATH = "./data/taubench_airline_encoded.xlsx"
 
+METRIC_COLUMNS = [
+    "Intent Alignment - Task (Flag (match/no match))",
+    "Error Awareness & Recovery",
+    "State Tracking Consistency",
+    "Tool Correctness",
+    "Tool Choice Accuracy",
+    "Plan Adherence Metric",
+]
+
+
+def encode_labels(df: pd.DataFrame) -> pd.DataFrame:
+    """Map success/failure outcomes and match/no match rubric labels to 1/0."""
+    # Encode mappings
+    match_map = {"match": 1, "no match": 0}
+
+    outcome_map = {"success": 1, "failure": 0}
+
+    # Apply encodings
+    df["Task Success/Failure"] = df["Task Success/Failure"].map(outcome_map)
+
+    for col in METRIC_COLUMNS:
+        df[col] = df[col].map(match_map)
+
+    return df
+
 
 if __name__ == "__main__":
     # Argument parser
@@ -24,31 +51,20 @@ if __name__ == "__main__":
         default=OUTPUT_PATH,
         help="Path to save the encoded Excel file.",
     )
+    add_instrumentation_args(parser)
     args = parser.parse_args()
+    instrumentation = Instrumentation.from_args(args, script="label_encoding")
 
     # Load data
-    df = pd.read_excel(args.input)
-
-    # Encode mappings
-    match_map = {"match": 1, "no match": 0}
-
-    outcome_map = {"success": 1, "failure": 0}
-
-    # Apply encodings
-    df["Task Success/Failure"] = df["Task Success/Failure"].map(outcome_map)
-
-    metric_columns = [
-        "Intent Alignment - Task (Flag (match/no match))",
-        "Error Awareness & Recovery",
-        "State Tracking Consistency",
-        "Tool Correctness",
-        "Tool Choice Accuracy",
-        "Plan Adherence Metric",
-    ]
+    with instrumentation.stage("read_excel") as stage:
+        df = pd.read_excel(args.input)
+        stage.items = len(df)
 
-    for col in metric_columns:
-        df[col] = df[col].map(match_map)
+    with instrumentation.stage("encode_labels", items=len(df)):
+        df = encode_labels(df)
 
     # Save encoded file
-    df.to_excel(args.output, index=False)
+    with instrumentation.stage("write_excel", items=len(df)):
+        df.to_excel(args.output, index=False)
     print("Encoding complete. Saved to:", OUTPUT_PATH)
+    instrumentation.close()
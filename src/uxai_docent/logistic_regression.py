@@ -1,16 +1,59 @@
 """Train a logistic regression model and compute SHAP values for feature attribution."""
 
 import argparse
+from typing import Optional
 
 import pandas as pd
 import shap
 from sklearn.linear_model import LogisticRegression
 
+from uxai_docent.instrumentation import Instrumentation, add_instrumentation_args
+
 
 # Load encoded data
 DATA_PATH = "./data/taubench_airline_encoded.xlsx"
 OUTPUT_PATH = "./data/taubench_airline_shap_per_run.csv"
 
+X_COLS = [
+    "Intent Alignment",
+    "Error Awareness & Recovery",
+    "State Tracking Consistency",
+    "Tool Correctness",
+    "Tool Choice Accuracy",
+    "Plan Adherence Metric",
+]
+
+
+def per_run_shap(
+    df: pd.DataFrame, instrumentation: Optional[Instrumentation] = None
+) -> pd.DataFrame:
+    """Fit the logistic regression and return the per-run SHAP attribution table."""
+    instrumentation = instrumentation or Instrumentation()
+
+    # Features and label
+    X = df[X_COLS]
+    y = df["Task Success/Failure"]
+
+    # Train tiny predictor
+    model = LogisticRegression(penalty="l2", solver="liblinear", random_state=42)
+
+    with instrumentation.stage("fit_logistic_regression", items=len(X)):
+        model.fit(X, y)
+
+    # SHAP explainer
+    with instrumentation.stage("shap_values", items=len(X)):
+        explainer = shap.LinearExplainer(model, X)
+        shap_values = explainer.shap_values(X)
+
+    # Per-run SHAP attribution table
+    shap_df = pd.DataFrame(shap_values, columns=X_COLS)
+
+    # Add metadata
+    shap_df["task_id"] = df["Task ID "]
+    shap_df["success"] = y.values
+
+    return shap_df
+
 
 if __name__ == "__main__":
     # Argument parser
@@ -26,42 +69,21 @@ if __name__ == "__main__":
         default=OUTPUT_PATH,
         help="Path to save the SHAP output CSV file.",
     )
+    add_instrumentation_args(parser)
     args = parser.parse_args()
+    instrumentation = Instrumentation.from_args(args, script="logistic_regression")
 
     # Load data
-    df = pd.read_excel(args.input)
+    with instrumentation.stage("read_excel") as stage:
+        df = pd.read_excel(args.input)
+        stage.items = len(df)
     print(df.columns.tolist())
 
-    # Features and label
-    X_cols = [
-        "Intent Alignment",
-        "Error Awareness & Recovery",
-        "State Tracking Consistency",
-        "Tool Correctness",
-        "Tool Choice Accuracy",
-        "Plan Adherence Metric",
-    ]
-
-    X = df[X_cols]
-    y = df["Task Success/Failure"]
-
-    # Train tiny predictor
-    model = LogisticRegression(penalty="l2", solver="liblinear", random_state=42)
-
-    model.fit(X, y)
-
-    # SHAP explainer
-    explainer = shap.LinearExplainer(model, X)
-    shap_values = explainer.shap_values(X)
-
-    # Per-run SHAP attribution table
-    shap_df = pd.DataFrame(shap_values, columns=X_cols)
-
-    # Add metadata
-    shap_df["task_id"] = df["Task ID "]
-    shap_df["success"] = y.values
+    shap_df = per_run_shap(df, instrumentation)
 
     # Save SHAP outputs
-    shap_df.to_csv(args.output, index=False)
+    with instrumentation.stage("write_csv", items=len(shap_df)):
+        shap_df.to_csv(args.output, index=False)
 
     print("SHAP attribution saved (per run)")
+    instrumentation.close()
@@ -4,10 +4,36 @@ import argparse
 
 import pandas as pd
 
+from uxai_docent.instrumentation import Instrumentation, add_instrumentation_args
+
 
 SHAP_PATH = "./data/taubench_airline_shap_per_run.csv"
 OUTPUT_PATH = "./data/taubench_airline_shap_global_ranking.csv"
 
+X_COLS = [
+    "Intent Alignment",
+    "Error Awareness & Recovery",
+    "State Tracking Consistency",
+    "Tool Correctness",
+    "Tool Choice Accuracy",
+    "Plan Adherence Metric",
+]
+
+
+def global_ranking(shap_df: pd.DataFrame) -> pd.DataFrame:
+    """Rank attributes by mean absolute SHAP value across runs."""
+    global_shap = (
+        shap_df[X_COLS]
+        .abs()  # magnitude of contribution
+        .mean()  # average across runs
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+
+    global_shap.columns = ["attribute", "mean_abs_shap"]
+    return global_shap
+
+
 if __name__ == "__main__":
     # Argument parser
     parser = argparse.ArgumentParser(
@@ -22,28 +48,18 @@ if __name__ == "__main__":
         default=OUTPUT_PATH,
         help="Path to save the global SHAP ranking CSV file.",
     )
+    add_instrumentation_args(parser)
     args = parser.parse_args()
+    instrumentation = Instrumentation.from_args(args, script="shap_global")
 
-    shap_df = pd.read_csv(args.input)
-
-    X_cols = [
-        "Intent Alignment",
-        "Error Awareness & Recovery",
-        "State Tracking Consistency",
-        "Tool Correctness",
-        "Tool Choice Accuracy",
-        "Plan Adherence Metric",
-    ]
+    with instrumentation.stage("read_csv") as stage:
+        shap_df = pd.read_csv(args.input)
+        stage.items = len(shap_df)
 
-    global_shap = (
-        shap_df[X_cols]
-        .abs()  # magnitude of contribution
-        .mean()  # average across runs
-        .sort_values(ascending=False)
-        .reset_index()
-    )
-
-    global_shap.columns = ["attribute", "mean_abs_shap"]
+    with instrumentation.stage("global_ranking", items=len(shap_df)):
+        global_shap = global_ranking(shap_df)
 
     print(global_shap)
-    global_shap.to_csv(args.output, index=False)
+    with instrumentation.stage("write_csv", items=len(global_shap)):
+        global_shap.to_csv(args.output, index=False)
+    instrumentation.close()
@@ -10,6 +10,8 @@ import argparse
 
 import matplotlib.pyplot as plt
 
+from uxai_docent.instrumentation import Instrumentation, add_instrumentation_args
+
 
 # Load per-run SHAP values
 SHAP_PATH = "./data/taubench_airline_shap_per_run.csv"
@@ -29,10 +31,14 @@ if __name__ == "__main__":
         default=OUTPUT_PATH,
         help="Path to save the encoded Excel file.",
     )
+    add_instrumentation_args(parser)
     args = parser.parse_args()
+    instrumentation = Instrumentation.from_args(args, script="shap_plot")
 
     # Load per-run SHAP values
-    shap_df = pd.read_csv(args.input)
+    with instrumentation.stage("read_csv") as stage:
+        shap_df = pd.read_csv(args.input)
+        stage.items = len(shap_df)
 
     X_cols = [
         "Intent Alignment",
@@ -47,13 +53,16 @@ if __name__ == "__main__":
     feature_values = shap_df[X_cols]
 
     # SHAP beeswarm plot
-    plt.figure(figsize=(7, 4))
-    shap.summary_plot(shap_values, feature_values, plot_type="dot", show=False)
+    with instrumentation.stage("summary_plot", items=len(shap_df)):
+        plt.figure(figsize=(7, 4))
+        shap.summary_plot(shap_values, feature_values, plot_type="dot", show=False)
 
-    plt.title("Global SHAP Summary (Behavioral Dimensions)")
-    plt.tight_layout()
+        plt.title("Global SHAP Summary (Behavioral Dimensions)")
+        plt.tight_layout()
 
-    plt.savefig(args.output)
-    plt.close()
+    with instrumentation.stage("savefig"):
+        plt.savefig(args.output)
+        plt.close()
 
     print(f"SHAP beeswarm saved to: {args.output}")
+    instrumentation.close()
@@ -0,0 +1,373 @@
+"""Seeded generator of HAL Weave-shaped UPLOAD traces for benchmarking."""
+
+import argparse
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+BENCHMARKS = ("taubench", "assistantbench")
+
+TOOLS = [
+    "get_user_details",
+    "get_reservation_details",
+    "search_direct_flight",
+    "book_reservation",
+    "cancel_reservation",
+    "update_reservation_flights",
+]
+BROWSER_ACTIONS = ["go_to_url", "click_element", "input_text", "scroll_down"]
+
+RUBRIC_COLUMNS = [
+    "intent alignment - task (flag (match/no match))",
+    "error awareness & recovery",
+    "state tracking consistency",
+    "tool correctness",
+    "tool choice accuracy",
+    "plan adherence metric",
+]
+SHAP_COLUMNS = [
+    "Intent Alignment",
+    "Error Awareness & Recovery",
+    "State Tracking Consistency",
+    "Tool Correctness",
+    "Tool Choice Accuracy",
+    "Plan Adherence Metric",
+]
+
+_WORDS = np.array(
+    [
+        "flight",
+        "reservation",
+        "passenger",
+        "cabin",
+        "economy",
+        "baggage",
+        "refund",
+        "airport",
+        "search",
+        "result",
+        "price",
+        "cancel",
+        "confirm",
+    ]
+)
+
+
+def _text(rng: np.random.Generator, num_words: int) -> str:
+    return " ".join(rng.choice(_WORDS, size=max(num_words, 1)))
+
+
+def _ui_dump(rng: np.random.Generator, num_words: int) -> str:
+    return (
+        "[Current state starts here]\nCurrent url: https://example.com\n"
+        f"Interactive elements:\n{_text(rng, num_words)}"
+    )
+
+
+@dataclass(frozen=True)
+class TauStep:
+    """One TAU-bench agent turn: a tool call and the reply the tool returned."""
+
+    tool: str
+    arguments: Dict[str, Any]
+    output: str
+    content: str = ""
+    exception: Optional[str] = None
+
+
+def taubench_task_spans(
+    task: Any,
+    steps: Sequence[TauStep],
+    *,
+    system_prompt: str = "You are an airline agent.",
+    user_request: str = "Please help me with my reservation.",
+    final_answer: str = "Done.",
+) -> List[Dict[str, Any]]:
+    """
+    Build the chat-completion spans of one TAU-bench task.
+
+    Like real Weave exports, each span's ``inputs.messages`` holds the full
+    conversation so far: the system prompt, the user request and, for every
+    earlier step, the assistant's tool call and the tool's reply. The span's
+    output is the step's own call; a last span returns final_answer, so
+    len(steps) + 1 spans are produced.
+    """
+    history: List[Dict[str, Any]] = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_request},
+    ]
+    spans = []
+    for step, turn in enumerate([*steps, None]):
+        if turn is None:
+            message: Dict[str, Any] = {"role": "assistant", "content": final_answer}
+        else:
+            message = {
+                "role": "assistant",
+                "content": turn.content,
+                "tool_calls": [
+                    {
+                        "id": f"call_{task}_{step}",
+                        "type": "function",
+                        "function": {
+                            "name": turn.tool,
+                            "arguments": json.dumps(turn.arguments),
+                        },
+                    }
+                ],
+            }
+
+        spans.append(
+            {
+                "weave_task_id": task,
+                "op_name": "openai.chat.completions.create",
+                "started_at": f"{step:08d}",
+                "ended_at": f"{step:08d}",
+                "inputs": {"messages": list(history)},
+                "output": {"choices": [{"message": message}]},
+                "exception": turn.exception if turn is not None else None,
+            }
+        )
+
+        if turn is not None:
+            history.append(message)
+            history.append(
+                {
+                    "role": "tool",
+                    "name": turn.tool,
+                    "content": turn.output,
+                    "tool_call_id": f"call_{task}_{step}",
+                }
+            )
+    return spans
+
+
+def _taubench_steps(
+    rng: np.random.Generator,
+    num_steps: int,
+    *,
+    message_words: int,
+    error_rate: float,
+    repeat_call_rate: float,
+    repeat_error_rate: float,
+) -> List[TauStep]:
+    steps: List[TauStep] = []
+    for _ in range(num_steps):
+        content = _text(rng, message_words)
+        exception = "Timeout" if rng.random() < error_rate / 4 else None
+        prev = steps[-1] if steps else None
+
+        if prev is not None and rng.random() < repeat_call_rate:
+            # Re-issue the previous call verbatim. A successful call returns
+            # the same reply; a failed one fails again with the same error
+            # with probability repeat_error_rate.
+            failed = prev.output.startswith("Error")
+            output = (
+                prev.output
+                if not failed or rng.random() < repeat_error_rate
+                else _text(rng, message_words)
+            )
+            steps.append(TauStep(prev.tool, prev.arguments, output, content, exception))
+            continue
+
+        tool = str(rng.choice(TOOLS))
+        arguments = {"reservation_id": f"R{rng.integers(10**6):06d}"}
+        output = (
+            f"Error: {_text(rng, message_words)}"
+            if rng.random() < error_rate
+            else _text(rng, message_words)
+        )
+        steps.append(TauStep(tool, arguments, output, content, exception))
+    return steps
+
+
+def _assistantbench_span(
+    rng: np.random.Generator,
+    task: int,
+    step: int,
+    *,
+    message_words: int,
+    ui_dump_fraction: float,
+    is_last: bool,
+) -> Dict[str, Any]:
+    user = (
+        _ui_dump(rng, message_words)
+        if rng.random() < ui_dump_fraction
+        else _text(rng, message_words)
+    )
+    action = str(rng.choice(BROWSER_ACTIONS))
+    actions: List[Dict[str, Any]] = [{action: {"text": _text(rng, 4)}}]
+    if is_last:
+        actions.append({"done": {"text": _text(rng, message_words)}})
+
+    return {
+        "weave_task_id": f"task-{task}",
+        "op_name": "langchain.ChatOpenAI",
+        "started_at": f"{step:08d}",
+        "inputs": {
+            "messages": [
+                {"role": "system", "content": "You are a browser agent."},
+                {"role": "user", "content": user},
+            ],
+            "raw": {
+                "_type": "AIMessage",
+                "tool_calls": [
+                    {
+                        "id": f"call_{task}_{step}",
+                        "name": "AgentOutput",
+                        "args": {
+                            "current_state": {"memory": _text(rng, message_words)},
+                            "action": actions,
+                        },
+                    }
+                ],
+                "response_metadata": {"finish_reason": "tool_calls"},
+            },
+        },
+    }
+
+
+def upload_trace(
+    spans: List[Dict[str, Any]], benchmark_name: str = "taubench_airline"
+) -> Dict[str, Any]:
+    """Wrap spans in the top-level layout of a HAL UPLOAD trace."""
+    return {
+        "config": {
+            "benchmark_name": benchmark_name,
+            "agent_name": "synthetic_agent",
+        },
+        "total_cost": 0.0,
+        "total_usage": {},
+        "raw_logging_results": spans,
+    }
+
+
+def generate_trace(
+    benchmark: str,
+    *,
+    num_tasks: int = 50,
+    spans_per_task: int = 20,
+    message_words: int = 50,
+    ui_dump_fraction: float = 0.5,
+    error_rate: float = 0.1,
+    repeat_call_rate: float = 0.1,
+    repeat_error_rate: float = 0.5,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Generate a synthetic HAL UPLOAD trace for ``taubench`` or ``assistantbench``.
+
+    Spans follow the shape each ``load_hal_weave_runs`` ingester reads.
+    ``ui_dump_fraction`` is the share of AssistantBench user messages that are
+    browser state dumps (dropped during ingestion). TAU-bench spans carry the
+    cumulative conversation (see ``taubench_task_spans``); ``error_rate`` is
+    the share of new tool calls that return an error, ``repeat_call_rate`` the
+    share of steps that re-issue the previous call verbatim, and
+    ``repeat_error_rate`` the share of such retries of a failed call that
+    return the identical error again.
+    """
+    if benchmark not in BENCHMARKS:
+        raise ValueError(f"Unknown benchmark: {benchmark}. Use one of {BENCHMARKS}.")
+
+    rng = np.random.default_rng(seed)
+    spans = []
+    for task in range(num_tasks):
+        if benchmark == "taubench":
+            if spans_per_task > 0:
+                steps = _taubench_steps(
+                    rng,
+                    spans_per_task - 1,
+                    message_words=message_words,
+                    error_rate=error_rate,
+                    repeat_call_rate=repeat_call_rate,
+                    repeat_error_rate=repeat_error_rate,
+                )
+                spans.extend(
+                    taubench_task_spans(
+                        task,
+                        steps,
+                        user_request=_text(rng, message_words),
+                        final_answer=_text(rng, message_words),
+                    )
+                )
+            continue
+
+        for step in range(spans_per_task):
+            spans.append(
+                _assistantbench_span(
+                    rng,
+                    task,
+                    step,
+                    message_words=message_words,
+                    ui_dump_fraction=ui_dump_fraction,
+                    is_last=step == spans_per_task - 1,
+                )
+            )
+
+    # Weave exports are not grouped by task.
+    order = rng.permutation(len(spans))
+    return upload_trace(
+        [spans[i] for i in order],
+        "taubench_airline" if benchmark == "taubench" else "assistantbench",
+    )
+
+
+def generate_rubric_table(num_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate a normalized rubric table in the shape ``evaluate_rubric`` reads."""
+    rng = np.random.default_rng(seed)
+    table = {
+        "task id": np.arange(num_rows).astype(str),
+        "task success/failure": rng.choice(["success", "failure"], size=num_rows),
+    }
+    for col in RUBRIC_COLUMNS:
+        table[col] = rng.choice(["match", "no match"], size=num_rows, p=[0.7, 0.3])
+    return pd.DataFrame(table)
+
+
+def generate_encoded_table(num_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate a 0/1 encoded table with the columns the SHAP scripts read."""
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, 2, size=(num_rows, len(SHAP_COLUMNS)))
+    logits = X @ rng.normal(size=len(SHAP_COLUMNS)) + rng.normal(size=num_rows)
+
+    df = pd.DataFrame(X, columns=SHAP_COLUMNS)
+    df["Task ID "] = np.arange(num_rows)
+    df["Task Success/Failure"] = (logits > np.median(logits)).astype(int)
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic HAL Weave UPLOAD trace"
+    )
+    parser.add_argument("--benchmark", choices=BENCHMARKS, required=True)
+    parser.add_argument("--output", required=True, help="Output JSON path")
+    parser.add_argument("--num-tasks", type=int, default=50)
+    parser.add_argument("--spans-per-task", type=int, default=20)
+    parser.add_argument("--message-words", type=int, default=50)
+    parser.add_argument("--ui-dump-fraction", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--repeat-call-rate", type=float, default=0.1)
+    parser.add_argument("--repeat-error-rate", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    trace = generate_trace(
+        args.benchmark,
+        num_tasks=args.num_tasks,
+        spans_per_task=args.spans_per_task,
+        message_words=args.message_words,
+        ui_dump_fraction=args.ui_dump_fraction,
+        error_rate=args.error_rate,
+        repeat_call_rate=args.repeat_call_rate,
+        repeat_error_rate=args.repeat_error_rate,
+        seed=args.seed,
+    )
+    with open(args.output, "w") as f:
+        json.dump(trace, f)
+
+    print(f"Wrote {len(trace['raw_logging_results'])} spans to {args.output}")
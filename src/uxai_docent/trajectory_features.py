@@ -0,0 +1,391 @@
+"""Heuristic rubric pre-screening computed directly from ingested HAL traces."""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from docent.data_models import AgentRun
+
+from uxai_docent.evaluation_metrics import evaluate_rubric, load_table
+
+
+MATCH = "match"
+NO_MATCH = "no match"
+
+INTENT_RUBRIC = "intent alignment - task (flag (match/no match))"
+ERROR_RUBRIC = "error awareness & recovery"
+TOOL_CORRECTNESS_RUBRIC = "tool correctness"
+TOOL_CHOICE_RUBRIC = "tool choice accuracy"
+
+# Message kinds shared by both ingesters.
+CALL = "call"
+RESPONSE = "response"
+ERROR = "error"
+EXCEPTION = "exception"
+ASSISTANT = "assistant"
+INPUT = "input"
+
+_TOOL_CALLS_MARKER = "[TOOL_CALLS]\n"
+_INVALID_TOOL_CALLS_MARKER = "[INVALID_TOOL_CALLS]"
+
+EPISODE_COLUMNS = [
+    "run",
+    "task_id",
+    "benchmark",
+    "position",
+    "role",
+    "kind",
+    "tool_name",
+    "op_name",
+    "signature",
+    "content",
+]
+
+
+def message_text(message: Any) -> str:
+    """Return the message content as a plain string."""
+    content = message.content
+    return content if isinstance(content, str) else str(content)
+
+
+def message_kind(role: str, content: str, metadata: Mapping[str, Any]) -> str:
+    """
+    Classify a message as call, response, error, exception, assistant or input.
+
+    Uses the ``type``/``is_error`` metadata and content prefixes written by
+    the TAU-bench ingester; anything else falls back to its role.
+    """
+    msg_type = metadata.get("type")
+    if msg_type == CALL or content.startswith("[TOOL CALL]"):
+        return CALL
+    if metadata.get("is_error") or content.startswith("[TOOL ERROR]"):
+        return ERROR
+    if msg_type == RESPONSE or content.startswith("[TOOL RESPONSE]"):
+        return RESPONSE
+    if msg_type == EXCEPTION or content.startswith("[EXCEPTION]"):
+        return EXCEPTION
+    return ASSISTANT if role == ASSISTANT else INPUT
+
+
+def iter_assistant_actions(content: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (action_name, signature) for each action in an AssistantBench payload.
+
+    The payload is the ``[TOOL_CALLS]`` JSON written by
+    ``extract_assistant_payload``. Browser-agent ``AgentOutput`` calls are
+    expanded into their individual actions (``go_to_url``, ``done``, ...).
+    """
+    start = content.find(_TOOL_CALLS_MARKER)
+    if start < 0:
+        return
+
+    try:
+        calls, _ = json.JSONDecoder().raw_decode(
+            content, start + len(_TOOL_CALLS_MARKER)
+        )
+    except json.JSONDecodeError:
+        return
+
+    for call in calls if isinstance(calls, list) else []:
+        if not isinstance(call, dict):
+            continue
+        args = call.get("args") or {}
+        actions = args.get("action") if isinstance(args, dict) else None
+
+        if isinstance(actions, list):
+            for action in actions:
+                if not isinstance(action, dict):
+                    continue
+                for name, params in action.items():
+                    yield name, f"{name}({json.dumps(params, sort_keys=True)})"
+        else:
+            name = str(call.get("name", ""))
+            yield name, f"{name}({json.dumps(args, sort_keys=True)})"
+
+
+def episode_table(runs: List[AgentRun]) -> pd.DataFrame:
+    """
+    Flatten AgentRuns into one row per message (or per AssistantBench action).
+
+    ``position`` is the message index within the run; actions expanded from
+    an AssistantBench assistant turn share the position of that turn, and an
+    ``[INVALID_TOOL_CALLS]`` section adds an ``error`` row at that position.
+    """
+    rows: List[Tuple[Any, ...]] = []
+
+    for run_idx, run in enumerate(runs):
+        meta = run.metadata or {}
+        task_id = str(meta.get("task_id", run_idx))
+        benchmark = str(meta.get("benchmark", ""))
+        position = 0
+
+        for transcript in run.transcripts:
+            for message in transcript.messages:
+                role = str(message.role)
+                content = message_text(message)
+                metadata = message.metadata or {}
+                kind = message_kind(role, content, metadata)
+                tool_name = metadata.get("tool_name")
+                op_name = metadata.get("op_name")
+                signature = (
+                    content.removeprefix("[TOOL CALL] ") if kind == CALL else None
+                )
+
+                base = (run_idx, task_id, benchmark, position, role)
+                rows.append(
+                    (*base, kind, tool_name, op_name, signature, content),
+                )
+
+                if kind == ASSISTANT:
+                    for name, action in iter_assistant_actions(content):
+                        rows.append((*base, CALL, name, op_name, action, action))
+                    if _INVALID_TOOL_CALLS_MARKER in content:
+                        rows.append(
+                            (
+                                *base,
+                                ERROR,
+                                None,
+                                op_name,
+                                None,
+                                _INVALID_TOOL_CALLS_MARKER,
+                            ),
+                        )
+
+                position += 1
+
+    return pd.DataFrame(rows, columns=EPISODE_COLUMNS)
+
+
+def trajectory_features(episodes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute per-run trajectory signals from an episode table.
+
+    Returns one row per run, indexed by ``run``, with:
+
+    - message, call, response, error and exception counts
+    - ``tool_error_rate``: errors over tool outcomes (responses + errors), or
+      over calls when the benchmark logs no responses (AssistantBench)
+    - ``repeated_calls``: calls identical to the run's previous call
+    - ``max_repeat_streak``: longest run of identical consecutive calls
+    - ``calls_after_error``: calls issued after the first error/exception
+    - ``repeated_after_error``: identical retries issued after an error
+    - ``recovered``: whether a successful tool step follows the last error
+    - ``has_done``: whether the run issued a ``done`` action
+    """
+    runs = episodes.groupby("run", sort=True)[["task_id", "benchmark"]].first()
+    kind = episodes["kind"]
+
+    is_call = kind == CALL
+    is_response = kind == RESPONSE
+    is_failure = kind.isin([ERROR, EXCEPTION])
+
+    counts = (
+        pd.crosstab(episodes["run"], kind)
+        .reindex(index=runs.index, columns=[CALL, RESPONSE, ERROR, EXCEPTION])
+        .fillna(0)
+        .astype(np.int64)
+    )
+    num_calls = counts[CALL]
+    num_responses = counts[RESPONSE]
+    num_errors = counts[ERROR]
+
+    # Tool-role responses/errors are logged outcomes (TAU-bench); otherwise
+    # errors (invalid AssistantBench tool calls) are measured against calls.
+    is_outcome = (episodes["role"] == "tool") & kind.isin([RESPONSE, ERROR])
+    logs_outcomes = is_outcome.groupby(episodes["run"]).any().reindex(runs.index)
+    denom = (num_responses + num_errors).where(logs_outcomes, num_calls)
+    error_rate = (num_errors / denom.where(denom > 0)).fillna(0.0)
+
+    # Identical consecutive calls within a run, ignoring interleaved messages.
+    calls = episodes.loc[is_call, ["run", "signature"]]
+    same_run = calls["run"].eq(calls["run"].shift())
+    repeated = same_run & calls["signature"].eq(calls["signature"].shift())
+    streak_id = (~repeated).cumsum()
+    streaks = repeated.groupby(streak_id).cumsum() + 1
+
+    # Rows strictly after the first error/exception of their run.
+    failures_before = is_failure.groupby(episodes["run"]).cumsum() - is_failure
+    after_error = failures_before > 0
+
+    # A successful step is a response, or a call where no outcomes are logged.
+    run_logs_outcomes = is_outcome.groupby(episodes["run"]).transform("any")
+    success = is_response | (is_call & ~run_logs_outcomes)
+    order = pd.Series(np.arange(len(episodes)), index=episodes.index)
+    last_failure = order[is_failure].groupby(episodes["run"]).max().reindex(runs.index)
+    last_success = order[success].groupby(episodes["run"]).max().reindex(runs.index)
+    recovered = last_failure.isna() | (last_success > last_failure)
+
+    has_done = (
+        (is_call & episodes["tool_name"].eq("done")).groupby(episodes["run"]).any()
+    )
+
+    features = runs.assign(
+        num_messages=episodes.groupby("run")["position"].nunique(),
+        num_tool_calls=num_calls,
+        num_tool_responses=num_responses,
+        num_tool_errors=num_errors,
+        num_exceptions=counts[EXCEPTION],
+        tool_error_rate=error_rate,
+        repeated_calls=repeated.groupby(calls["run"]).sum(),
+        max_repeat_streak=streaks.groupby(calls["run"]).max(),
+        calls_after_error=(is_call & after_error).groupby(episodes["run"]).sum(),
+        repeated_after_error=(repeated & after_error[calls.index])
+        .groupby(calls["run"])
+        .sum(),
+        recovered=recovered,
+        has_done=has_done.reindex(runs.index, fill_value=False),
+    )
+
+    int_cols = ["repeated_calls", "max_repeat_streak", "repeated_after_error"]
+    features[int_cols] = features[int_cols].fillna(0).astype(np.int64)
+    return features
+
+
+def rubric_flags(
+    features: pd.DataFrame,
+    *,
+    max_error_rate: float = 0.0,
+    max_repeated_calls: int = 0,
+) -> pd.DataFrame:
+    """
+    Map trajectory features to match/no match rubric columns.
+
+    - tool correctness: tool error rate above ``max_error_rate``
+    - error awareness & recovery: an error or exception that is never
+      followed by a successful step, or that is answered by an identical retry
+    - tool choice accuracy: more than ``max_repeated_calls`` identical
+      consecutive calls (retry loops)
+    - intent alignment: an AssistantBench run that never calls ``done``
+
+    ``needs_judging`` marks runs with at least one flag; the remaining runs
+    can skip the judging pass for these rubrics.
+    """
+    failed = (features["num_tool_errors"] + features["num_exceptions"]) > 0
+    is_assistantbench = features["benchmark"].str.contains("assistantbench", case=False)
+
+    flags = {
+        INTENT_RUBRIC: is_assistantbench & ~features["has_done"],
+        ERROR_RUBRIC: failed
+        & (~features["recovered"] | (features["repeated_after_error"] > 0)),
+        TOOL_CORRECTNESS_RUBRIC: features["tool_error_rate"] > max_error_rate,
+        TOOL_CHOICE_RUBRIC: features["repeated_calls"] > max_repeated_calls,
+    }
+
+    table = pd.DataFrame(
+        {name: np.where(flag, NO_MATCH, MATCH) for name, flag in flags.items()},
+        index=features.index,
+    )
+    table["needs_judging"] = pd.DataFrame(flags).any(axis=1)
+    return table
+
+
+def screen_runs(
+    runs: List[AgentRun],
+    outcomes: Optional[Mapping[str, str]] = None,
+    *,
+    max_error_rate: float = 0.0,
+    max_repeated_calls: int = 0,
+) -> pd.DataFrame:
+    """
+    Pre-screen AgentRuns into a rubric table accepted by ``evaluate_rubric``.
+
+    outcomes maps task_id to ``"success"``/``"failure"``; when given it is
+    added as the ``task_outcome`` column. Feature columns are kept alongside
+    the rubric columns.
+    """
+    features = trajectory_features(episode_table(runs))
+    table = pd.concat(
+        [
+            features,
+            rubric_flags(
+                features,
+                max_error_rate=max_error_rate,
+                max_repeated_calls=max_repeated_calls,
+            ),
+        ],
+        axis=1,
+    )
+
+    if outcomes is not None:
+        normalized = {
+            str(k).strip(): str(v).strip().lower() for k, v in outcomes.items()
+        }
+        table.insert(1, "task_outcome", table["task_id"].map(normalized))
+
+    return table.reset_index(drop=True)
+
+
+def load_outcomes(path: str) -> Dict[str, str]:
+    """Read task_id -> success/failure from a labelled rubric sheet."""
+    df = load_table(path)
+    outcome_col = (
+        "task success/failure" if "task success/failure" in df else "task_outcome"
+    )
+    return dict(zip(df["task id"].astype(str), df[outcome_col].astype(str)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Pre-screen HAL traces with heuristic rubric signals"
+    )
+    parser.add_argument("--trace-path", required=True, help="HAL UPLOAD JSON file")
+    parser.add_argument(
+        "--benchmark",
+        choices=["taubench", "assistantbench"],
+        required=True,
+        help="Which ingester parses the trace",
+    )
+    parser.add_argument(
+        "--outcomes",
+        default=None,
+        help="Optional labelled CSV/XLSX with Task ID and Task Success/Failure",
+    )
+    parser.add_argument("--output", required=True, help="Output CSV/XLSX path")
+    parser.add_argument("--max-error-rate", type=float, default=0.0)
+    parser.add_argument("--max-repeated-calls", type=int, default=0)
+
+    args = parser.parse_args()
+
+    if args.benchmark == "taubench":
+        from uxai_docent.ingest_docent_taubench import load_hal_weave_runs
+    else:
+        from uxai_docent.ingest_docent_assistant import load_hal_weave_runs
+
+    with open(args.trace_path, "r") as f:
+        log = json.load(f)
+
+    agent_runs = load_hal_weave_runs(log)
+    outcomes = load_outcomes(args.outcomes) if args.outcomes else None
+
+    screened = screen_runs(
+        agent_runs,
+        outcomes,
+        max_error_rate=args.max_error_rate,
+        max_repeated_calls=args.max_repeated_calls,
+    )
+
+    output = Path(args.output)
+    if output.suffix in {".xlsx", ".xls"}:
+        screened.to_excel(output, index=False)
+    else:
+        screened.to_csv(output, index=False)
+
+    print(f"Screened {len(screened)} runs -> {output}")
+    print(f"Runs needing judging: {int(screened['needs_judging'].sum())}")
+
+    if outcomes is not None:
+        for rubric in [
+            INTENT_RUBRIC,
+            ERROR_RUBRIC,
+            TOOL_CORRECTNESS_RUBRIC,
+            TOOL_CHOICE_RUBRIC,
+        ]:
+            _, fm, rel = evaluate_rubric(
+                screened.dropna(subset=["task_outcome"]), rubric
+            )
+            print(f"\n--- Heuristic: {rubric.upper()} ---")
+            for k, v in {**fm, **rel}.items():
+                print(f"  {k}: {v}")
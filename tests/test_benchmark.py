@@ -0,0 +1,92 @@
+"""Tests for the synthetic trace generator and offline benchmark suite."""
+
+import json
+
+import pytest
+
+
+pytest.importorskip("docent")
+
+from uxai_docent import (  # noqa: E402
+    benchmark,
+    ingest_docent_assistant,
+    ingest_docent_taubench,
+)
+from uxai_docent.benchmark import (  # noqa: E402
+    SHAP_CASES,
+    available_cases,
+    run_benchmarks,
+)
+from uxai_docent.synthetic_traces import generate_trace  # noqa: E402
+
+
+def test_generated_traces_ingest() -> None:
+    tau = generate_trace("taubench", num_tasks=4, spans_per_task=3, seed=1)
+    assert generate_trace("taubench", num_tasks=4, spans_per_task=3, seed=1) == tau
+    assert len(ingest_docent_taubench.load_hal_weave_runs(tau)) == 4
+
+    clean = generate_trace("assistantbench", num_tasks=3, ui_dump_fraction=0.0)
+    dumps = generate_trace("assistantbench", num_tasks=3, ui_dump_fraction=1.0)
+    clean_runs = ingest_docent_assistant.load_hal_weave_runs(clean)
+    dump_runs = ingest_docent_assistant.load_hal_weave_runs(dumps)
+
+    assert len(clean_runs) == len(dump_runs) == 3
+    assert all("done" in run.transcripts[0].messages[-1].text for run in clean_runs)
+    # UI dumps are dropped, so only the system prompt and assistant turns remain.
+    assert sum(len(r.transcripts[0].messages) for r in dump_runs) < sum(
+        len(r.transcripts[0].messages) for r in clean_runs
+    )
+
+
+def test_taubench_spans_carry_history_and_repeats() -> None:
+    trace = generate_trace(
+        "taubench",
+        num_tasks=1,
+        spans_per_task=5,
+        error_rate=1.0,
+        repeat_call_rate=1.0,
+        repeat_error_rate=1.0,
+    )
+    spans = sorted(trace["raw_logging_results"], key=lambda s: s["started_at"])
+
+    # Every span replays the conversation so far: system, user, then one
+    # assistant call and one tool reply per earlier step.
+    assert [len(s["inputs"]["messages"]) for s in spans] == [2, 4, 6, 8, 10]
+    assert spans[-1]["inputs"]["messages"][:6] == spans[2]["inputs"]["messages"]
+
+    calls = [
+        m["tool_calls"][0]["function"]
+        for m in spans[-1]["inputs"]["messages"]
+        if m["role"] == "assistant"
+    ]
+    replies = [
+        m["content"] for m in spans[-1]["inputs"]["messages"] if m["role"] == "tool"
+    ]
+    assert len(calls) == 4
+    assert all(call == calls[0] for call in calls)
+    assert len(set(replies)) == 1
+    assert replies[0].startswith("Error")
+
+
+def test_run_benchmarks_report() -> None:
+    params = {"num_tasks": 3, "spans_per_task": 2, "rubric_rows": 50, "shap_rows": 40}
+    report = run_benchmarks(params, repeat=1)
+
+    assert set(report["results"]) == set(available_cases())
+    assert report["params"]["num_tasks"] == 3
+    for result in report["results"].values():
+        assert result["items"] > 0
+        assert result["wall_s_min"] >= 0
+        assert result["peak_mem_mb"] >= 0
+    json.dumps(report)
+
+
+def test_shap_cases_skipped_without_shap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(benchmark, "find_spec", lambda name: None)
+
+    report = run_benchmarks(
+        {"rubric_rows": 20}, cases=["evaluate_rubric", *SHAP_CASES], repeat=1
+    )
+
+    assert list(report["results"]) == ["evaluate_rubric"]
+    assert report["skipped"] == list(SHAP_CASES)
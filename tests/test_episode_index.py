@@ -0,0 +1,72 @@
+"""Tests for the on-disk episode inverted index."""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+
+pytest.importorskip("docent")
+
+from docent.data_models import AgentRun  # noqa: E402
+
+from uxai_docent.episode_index import EpisodeIndex, build_index  # noqa: E402
+from uxai_docent.ingest_docent_taubench import load_hal_weave_runs  # noqa: E402
+from uxai_docent.synthetic_traces import (  # noqa: E402
+    TauStep,
+    taubench_task_spans,
+    upload_trace,
+)
+
+
+def _runs() -> List[AgentRun]:
+    # Each run: system (0), user (1), then a call and its reply per step.
+    def task(task_id: str, *steps: TauStep) -> List[dict]:
+        return taubench_task_spans(task_id, steps, user_request="Cancel my reservation")
+
+    return load_hal_weave_runs(
+        upload_trace(
+            [
+                *task("a", TauStep("cancel", {}, "Error: not found")),
+                *task(
+                    "b",
+                    TauStep("search", {}, "ok"),
+                    TauStep("cancel", {}, "Cancelled"),
+                ),
+                *task("c", TauStep("cancel", {}, "Cancelled")),
+            ]
+        )
+    )
+
+
+def test_roundtrip_and_queries(tmp_path: Path) -> None:
+    build_index(_runs(), tmp_path / "index")
+    index = EpisodeIndex.load(tmp_path / "index")
+
+    assert isinstance(index.postings, np.memmap)
+    assert index.task_ids == ["a", "b", "c"]
+    assert index.frequency("tool:cancel") == 6
+
+    errors = index.messages(["tool:cancel", "kind:error"])
+    assert errors.to_dict("records") == [{"task_id": "a", "position": 3}]
+
+    assert index.match(all_of=["tok:reservation", "kind:response"]) == ["b", "c"]
+    assert index.match(any_of=["kind:error", "tool:search"]) == ["a", "b"]
+    assert index.match(all_of=["tool:cancel"], none_of=["kind:error"]) == ["b", "c"]
+    assert index.match(all_of=["op:openai.chat.completions.create"]) == [
+        "a",
+        "b",
+        "c",
+    ]
+    assert index.match(all_of=["tok:missing"]) == []
+
+    seq = index.sequence(["tool:cancel", "kind:call"], "kind:response")
+    assert seq.to_dict("records") == [
+        {"task_id": "b", "first_position": 4, "then_position": 5},
+        {"task_id": "c", "first_position": 2, "then_position": 3},
+    ]
+    search_call = ["tool:search", "kind:call"]
+    assert len(index.sequence(search_call, "tool:cancel", within=1)) == 0
+    assert len(index.sequence(search_call, "tool:cancel", within=2)) == 1
+    assert len(index.sequence("kind:input", "tool:cancel", within=1)) == 2
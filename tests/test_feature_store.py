@@ -0,0 +1,39 @@
+"""Tests for the memory-mapped feature store."""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import scipy.sparse as sp
+
+from traditional_test.feature_store import FeatureStore
+
+
+def _is_memmap_backed(array: Any) -> bool:
+    base = array
+    while base is not None and not isinstance(base, np.memmap):
+        base = getattr(base, "base", None)
+    return base is not None
+
+
+def test_roundtrip_is_memory_mapped(tmp_path: Path) -> None:
+    store = FeatureStore(tmp_path / "features")
+    X = sp.random(20, 50, density=0.1, random_state=0, format="csr")
+    padded = np.random.RandomState(0).randint(0, 100, size=(20, 16)).astype(np.int32)
+
+    store.save("X_train", X)
+    store.save("X_train_pad", padded)
+    store.save("X_train_pad", padded[:, :8])  # overwrite in place
+
+    loaded: Any = store.load("X_train")
+    assert sp.issparse(loaded)
+    assert (loaded != X).nnz == 0
+    assert _is_memmap_backed(loaded.data) and _is_memmap_backed(loaded.indices)
+
+    loaded_pad = store.load("X_train_pad")
+    assert loaded_pad.dtype == np.int32
+    np.testing.assert_array_equal(loaded_pad, padded[:, :8])
+    assert isinstance(loaded_pad, np.memmap)
+
+    assert store.names() == ["X_train", "X_train_pad"]
+    assert "missing" not in store
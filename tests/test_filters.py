@@ -0,0 +1,81 @@
+"""Tests for the vectorised Conv1D n-gram analysis."""
+
+import tracemalloc
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from traditional_test.filters import (
+    FilterNgramStats,
+    analyze_conv_filters,
+    encode_ngram_windows,
+)
+
+
+KERNEL = 3
+
+
+def _fake_conv(batch: np.ndarray, training: bool = False) -> np.ndarray:
+    windows = np.lib.stride_tricks.sliding_window_view(batch, KERNEL, axis=1)
+    weights = np.random.RandomState(1).randn(KERNEL, 4)
+    return np.sin(windows.astype(float)) @ weights
+
+
+def _naive_ngrams(X: np.ndarray, index_word: Any) -> pd.Series:
+    acts = _fake_conv(X)
+    rows = []
+    for d in range(acts.shape[0]):
+        for p in range(acts.shape[1]):
+            for f in range(acts.shape[2]):
+                if acts[d, p, f] > 0:
+                    words = [
+                        index_word.get(t, "<UNK>") for t in X[d, p : p + KERNEL] if t
+                    ]
+                    if words:
+                        rows.append((" ".join(words), acts[d, p, f]))
+    df = pd.DataFrame(rows, columns=["ngram", "activation"])
+    return df.groupby("ngram")["activation"].mean()
+
+
+def test_matches_naive_loop() -> None:
+    rng = np.random.RandomState(0)
+    X = rng.randint(1, 6, size=(9, 10))
+    X[:, 7:] = 0  # post padding
+    index_word = {i: f"w{i}" for i in range(1, 6)}
+
+    stats = analyze_conv_filters(_fake_conv, X, KERNEL, top_k=4, batch_size=2)
+
+    expected = _naive_ngrams(X, index_word).sort_values(ascending=False)
+    top = stats.global_ngrams(index_word, top_n=5)
+    np.testing.assert_allclose(top.values, expected.values[:5])
+    assert set(top.index) <= set(expected.index)
+
+    acts = _fake_conv(X)[:, :7]  # the last window is padding only
+    positions = stats.filter_top_positions(index_word)
+    for f, group in positions.groupby("filter"):
+        best = np.sort(acts[..., f].ravel())[::-1][: len(group)]
+        np.testing.assert_allclose(group["activation"].values, best)
+
+
+def test_update_does_not_copy_batch() -> None:
+    rng = np.random.RandomState(0)
+    X = rng.randint(0, 50, size=(64, 100 + KERNEL - 1))
+    keys, windows = encode_ngram_windows(X, KERNEL)
+    activations = rng.randn(64, 100, 128).astype(np.float32)
+    stats = FilterNgramStats(keys, windows, top_k=10)
+
+    tracemalloc.start()
+    try:
+        stats.update(0, activations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Temporaries are per filter column, far smaller than the batch itself.
+    assert peak < activations.nbytes / 4
+    assert stats.top_values.shape == (10, 128)
+    np.testing.assert_allclose(
+        np.sort(stats.top_values, axis=0)[::-1],
+        np.sort(activations.reshape(-1, 128), axis=0)[::-1][:10],
+    )
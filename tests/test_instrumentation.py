@@ -0,0 +1,61 @@
+"""Tests for the stage-level instrumentation layer."""
+
+import json
+from pathlib import Path
+
+from uxai_docent.instrumentation import Instrumentation
+
+
+def test_disabled_records_nothing(tmp_path: Path) -> None:
+    instrumentation = Instrumentation()
+    with instrumentation.stage("noop", items=3) as record:
+        record.items = 4
+
+    assert instrumentation.records == []
+    assert instrumentation.close() is None
+
+
+def test_report_and_slowest_profile(tmp_path: Path) -> None:
+    instrumentation = Instrumentation(
+        report_path=tmp_path / "report.json",
+        profile_dir=tmp_path / "profiles",
+        script="demo",
+    )
+
+    with instrumentation.stage("fast", items=1):
+        pass
+    with instrumentation.stage("slow") as record:
+        with instrumentation.stage("inner", items=2):
+            sum(i * i for i in range(200_000))
+        record.items = 10
+
+    path = instrumentation.close()
+    assert path == tmp_path / "report.json"
+
+    report = json.loads(path.read_text())
+    stages = {s["name"]: s for s in report["stages"]}
+    assert [s["name"] for s in report["stages"]] == ["fast", "inner", "slow"]
+    assert stages["slow"]["items"] == 10
+    assert stages["slow"]["wall_s"] >= stages["inner"]["wall_s"] > 0
+    assert report["slowest_stage"] == "slow"
+    assert report["script"] == "demo"
+
+    # Only the slowest top-level stage is dumped.
+    assert report["profile"] == str(tmp_path / "profiles" / "demo.slow.prof")
+    assert [p.name for p in (tmp_path / "profiles").iterdir()] == ["demo.slow.prof"]
+
+
+def test_timed_accumulates_calls() -> None:
+    def double(x: int) -> int:
+        return 2 * x
+
+    assert Instrumentation().timed("double", double) is double
+
+    instrumentation = Instrumentation(enabled=True)
+    timed_double = instrumentation.timed("double", double)
+    assert [timed_double(i) for i in range(5)] == [0, 2, 4, 6, 8]
+
+    (record,) = instrumentation.records
+    assert record.name == "double"
+    assert record.items == 5
+    assert record.wall_s > 0
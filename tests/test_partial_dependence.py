@@ -0,0 +1,66 @@
+"""Tests for sparse partial dependence."""
+
+from typing import Any
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression
+
+from traditional_test.partial_dependence import (
+    column_summary,
+    partial_dependence,
+    sparse_quantiles,
+)
+
+
+def _data() -> Any:
+    rng = np.random.RandomState(0)
+    X = sp.random(60, 12, density=0.3, random_state=rng, format="csr")
+    X.data -= 0.3  # mix of negative and positive non-zeros
+    y = rng.randint(0, 2, size=60)
+    return X, y
+
+
+class _Opaque:
+    """Hides coef_ so partial_dependence takes the predict_proba path."""
+
+    def __init__(self, model: Any) -> None:
+        self.model = model
+
+    def predict_proba(self, X: Any) -> Any:
+        return self.model.predict_proba(X)
+
+
+def test_sparse_quantiles_match_dense() -> None:
+    X, _ = _data()
+    qs = [0.0, 0.1, 0.37, 0.5, 0.9, 1.0]
+    expected = np.quantile(X.toarray(), qs, axis=0).T
+
+    np.testing.assert_allclose(sparse_quantiles(X, np.arange(12), qs), expected)
+
+    summary = column_summary(X, [3, 7])
+    np.testing.assert_allclose(summary["mean"], X.toarray()[:, [3, 7]].mean(axis=0))
+
+
+def test_closed_form_matches_brute_force() -> None:
+    X, y = _data()
+    clf = LogisticRegression().fit(X, y)
+    names = np.array([f"f{i}" for i in range(12)])
+
+    pd_fast = partial_dependence(
+        clf, X, ["f2", "f5", 9], feature_names=names, num_points=7, return_ice=True
+    )
+    pd_slow = partial_dependence(
+        _Opaque(clf), X, [2, 5, 9], num_points=7, return_ice=True
+    )
+
+    np.testing.assert_allclose(pd_fast.average, pd_slow.average)
+    assert pd_fast.individual is not None and pd_slow.individual is not None
+    np.testing.assert_allclose(pd_fast.individual, pd_slow.individual)
+    assert list(pd_fast.feature_names) == ["f2", "f5", "f9"]
+
+    dense = X.toarray()
+    dense[:, 5] = pd_fast.grid[1, 3]
+    expected = expit(dense @ clf.coef_[0] + clf.intercept_[0]).mean()
+    np.testing.assert_allclose(pd_fast.average[1, 3], expected)
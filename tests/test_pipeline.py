@@ -0,0 +1,114 @@
+"""Tests for the cached traditional-track experiment runner."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
+
+from traditional_test import pipeline
+from traditional_test.pipeline import ExperimentRunner, parse_overrides
+
+
+def _write_posts(path: Path, n: int = 120) -> None:
+    rng = np.random.RandomState(0)
+    it_words = ["python", "java", "developer", "software", "database", "linux"]
+    other_words = ["sales", "accounting", "marketing", "finance", "driver", "nurse"]
+    rows = []
+    for i in range(n):
+        label = i % 2
+        words = it_words if label else other_words
+        text = " ".join(rng.choice(words + ["team", "work"], size=rng.randint(5, 30)))
+        rows.append(
+            {
+                "Title": f"job {i}",
+                "JobDescription": text,
+                "JobRequirment": "experience required",
+                "RequiredQual": text,
+                "IT": label,
+            }
+        )
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def test_stage_cache_reuse(tmp_path: Path) -> None:
+    data = tmp_path / "posts.csv"
+    _write_posts(data)
+    config = {
+        "split": {"len_bins": 2},
+        "vectorize": {"min_df": 1},
+        "masking": {"top_k": 3},
+        "stability": {"num_bootstrap": 3},
+    }
+
+    first = ExperimentRunner(data, tmp_path / "cache", config)
+    drops = first.run("masking")
+    assert {e["status"] for e in first.log} == {"computed"}
+    assert set(drops) == {"base_accuracy", "drop_top_it", "drop_top_non_it"}
+
+    config["masking"]["top_k"] = 5
+    second = ExperimentRunner(data, tmp_path / "cache", config)
+    second.run("masking")
+    second.run("stability")
+    status = {e["stage"]: e["status"] for e in second.log}
+    assert status == {
+        "split": "cached",
+        "vectorize": "cached",
+        "fit": "cached",
+        "masking": "computed",
+        "stability": "computed",
+    }
+    assert -1.0 <= second.run("stability")["lr_stability"] <= 1.0
+
+
+def test_saliency_key_ignores_fit_config(tmp_path: Path) -> None:
+    data = tmp_path / "posts.csv"
+    _write_posts(data)
+
+    base = ExperimentRunner(data, tmp_path / "cache", {})
+    changed = ExperimentRunner(data, tmp_path / "cache", {"fit": {"max_iter": 50}})
+
+    assert base.stage_key("fit") != changed.stage_key("fit")
+    assert base.stage_key("saliency") == changed.stage_key("saliency")
+
+
+def test_check_requirements_names_missing_package(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        pipeline, "find_spec", lambda name: None if name == "tensorflow" else name
+    )
+
+    pipeline.check_requirements(["fit", "shap", "lime"])
+    with pytest.raises(
+        ImportError, match=r"tensorflow \(needed by saliency, tokenize\)"
+    ):
+        pipeline.check_requirements(["saliency"])
+
+
+def test_parse_overrides() -> None:
+    assert parse_overrides(["lime.index=5", "vectorize.ngram_range=[1,1]"]) == {
+        "lime": {"index": 5},
+        "vectorize": {"ngram_range": [1, 1]},
+    }
+
+
+def test_bootstrap_counts_match_frozen_vectorizer(tmp_path: Path) -> None:
+    data = tmp_path / "posts.csv"
+    _write_posts(data)
+    runner = ExperimentRunner(
+        data, tmp_path / "cache", {"split": {"len_bins": 2}, "vectorize": {"min_df": 1}}
+    )
+    split, vec = runner.run("split"), runner.run("vectorize")
+    tfidf = vec["vectorizer"]
+    assert not vec["X_train"].data.flags.writeable  # read-only memory map
+
+    idx = np.random.RandomState(0).randint(0, len(split["train"]), len(split["train"]))
+    frozen = TfidfVectorizer(
+        vocabulary=tfidf.vocabulary_, ngram_range=tfidf.ngram_range
+    )
+    expected = frozen.fit_transform(split["train"]["full_text"].iloc[idx])
+    actual = TfidfTransformer().fit_transform(vec["C_train"][idx])
+
+    np.testing.assert_allclose(actual.toarray(), expected.toarray())
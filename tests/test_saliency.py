@@ -0,0 +1,94 @@
+"""Tests for the batched CNN saliency engine."""
+
+import gc
+import weakref
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import pytest
+
+from traditional_test.saliency import (
+    _SALIENCY_FN_ATTR,
+    TokenSaliencyAggregator,
+    batched_saliency,
+    build_embedding_model,
+    compute_saliency_embeddings,
+    global_saliency_vector,
+    make_saliency_fn,
+    mean_abs_position_saliency,
+)
+
+
+@pytest.fixture
+def tf() -> Any:
+    return pytest.importorskip("tensorflow")
+
+
+def _tiny_cnn(tf: Any, vocab: int = 50, seq_len: int = 12) -> Any:
+    tf.keras.utils.set_random_seed(0)
+    inputs = tf.keras.layers.Input(shape=(seq_len,), name="input_ids")
+    x = tf.keras.layers.Embedding(vocab, 8, name="embedding")(inputs)
+    x = tf.keras.layers.Conv1D(4, 3, activation="relu")(x)
+    x = tf.keras.layers.GlobalMaxPooling1D()(x)
+    outputs = tf.keras.layers.Dense(1, activation="sigmoid")(x)
+    return tf.keras.Model(inputs, outputs)
+
+
+def test_batched_matches_single_example(tf: Any) -> None:
+    emb_model = build_embedding_model(_tiny_cnn(tf))
+    X = np.random.RandomState(0).randint(0, 50, size=(7, 12)).astype(np.int32)
+
+    batched = batched_saliency(emb_model, X, batch_size=3)
+    single = np.stack([compute_saliency_embeddings(emb_model, x) for x in X])
+
+    np.testing.assert_allclose(batched, single, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(
+        mean_abs_position_saliency(emb_model, X, batch_size=4),
+        np.abs(single).mean(axis=0),
+        rtol=1e-5,
+        atol=1e-6,
+    )
+
+
+def test_saliency_fn_does_not_pin_model(tf: Any) -> None:
+    emb_model = build_embedding_model(_tiny_cnn(tf))
+    saliency_fn = make_saliency_fn(emb_model)
+    assert make_saliency_fn(emb_model) is saliency_fn
+    saliency_fn(tf.zeros((2, 12), dtype=tf.int32))
+
+    ref = weakref.ref(emb_model)
+    del emb_model, saliency_fn
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_token_aggregator_running_mean() -> None:
+    agg = TokenSaliencyAggregator(vocab_size=5, ignore_ids=(0, 1), absolute=True)
+    agg.update(np.array([[2, 3, 0]]), np.array([[1.0, -2.0, 9.0]]))
+    agg.update(np.array([[2, 1, 4]]), np.array([[3.0, 5.0, -1.0]]))
+
+    result = agg.to_dict({1: "<UNK>", 2: "a", 3: "b", 4: "c"})
+
+    assert result == {"a": 2.0, "b": 2.0, "c": 1.0}
+
+
+def test_aggregation_without_tensorflow() -> None:
+    # A stand-in model whose cached saliency is the token id itself, so the
+    # NumPy aggregation can be checked without building a network.
+    model = SimpleNamespace(**{_SALIENCY_FN_ATTR: lambda ids: -np.asarray(ids)})
+    tokenizer = SimpleNamespace(
+        num_words=None,
+        oov_token="<UNK>",
+        word_index={"<UNK>": 1, "a": 2, "b": 3},
+        index_word={1: "<UNK>", 2: "a", 3: "b"},
+    )
+    X = np.array([[2, 3, 1, 0], [3, 3, 0, 0], [2, 1, 0, 0]])
+
+    vector = global_saliency_vector(model, X, [0, 1], tokenizer, batch_size=1)
+    assert vector == {"a": 2.0, "b": 3.0}
+
+    np.testing.assert_allclose(
+        mean_abs_position_saliency(model, X, batch_size=2), np.abs(X).mean(axis=0)
+    )
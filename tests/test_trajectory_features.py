@@ -0,0 +1,132 @@
+"""Tests for the heuristic trajectory pre-screener."""
+
+from typing import Any, Dict, List
+
+import pytest
+
+
+pytest.importorskip("docent")
+
+from docent.data_models import AgentRun  # noqa: E402
+
+from uxai_docent import (  # noqa: E402
+    ingest_docent_assistant,
+    ingest_docent_taubench,
+)
+from uxai_docent.evaluation_metrics import evaluate_rubric  # noqa: E402
+from uxai_docent.synthetic_traces import (  # noqa: E402
+    TauStep,
+    generate_trace,
+    taubench_task_spans,
+    upload_trace,
+)
+from uxai_docent.trajectory_features import (  # noqa: E402
+    ERROR_RUBRIC,
+    EXCEPTION,
+    INTENT_RUBRIC,
+    TOOL_CHOICE_RUBRIC,
+    TOOL_CORRECTNESS_RUBRIC,
+    episode_table,
+    message_kind,
+    screen_runs,
+)
+
+
+def _assistantbench_trace() -> Dict[str, Any]:
+    trace = generate_trace(
+        "assistantbench", num_tasks=2, spans_per_task=2, ui_dump_fraction=0.0
+    )
+    # Drop the final step of task-1 so that run never calls done.
+    trace["raw_logging_results"] = [
+        span
+        for span in trace["raw_logging_results"]
+        if not (span["weave_task_id"] == "task-1" and span["started_at"].endswith("1"))
+    ]
+    return trace
+
+
+def _runs() -> List[AgentRun]:
+    book_full = TauStep("book", {"f": 1}, "Error: full")
+    tau = upload_trace(
+        [
+            *taubench_task_spans("clean", [TauStep("get_user", {"id": 1}, "{}")]),
+            *taubench_task_spans("retry", [book_full, book_full, book_full]),
+            *taubench_task_spans(
+                "recovered", [book_full, TauStep("book", {"f": 2}, "ok")]
+            ),
+        ]
+    )
+    return [
+        *ingest_docent_taubench.load_hal_weave_runs(tau),
+        *ingest_docent_assistant.load_hal_weave_runs(_assistantbench_trace()),
+    ]
+
+
+def test_message_kind_handles_exceptions() -> None:
+    metadata = {"source": "span_exception", "type": "exception"}
+    assert message_kind("tool", "[EXCEPTION] boom", metadata) == EXCEPTION
+
+
+def test_episode_table_orders_tool_outcomes() -> None:
+    episodes = episode_table(_runs())
+
+    # Each reply follows the call it answers, and repeated identical calls
+    # and errors are all kept.
+    recovered = episodes[episodes["task_id"] == "recovered"]
+    assert recovered["kind"].tolist() == [
+        "input",
+        "input",
+        "call",
+        "error",
+        "call",
+        "response",
+        "assistant",
+    ]
+    retry = episodes[episodes["task_id"] == "retry"]
+    assert retry["kind"].tolist()[2:8] == ["call", "error"] * 3
+
+
+def test_episode_table_expands_browser_actions() -> None:
+    episodes = episode_table(_runs())
+    last_turn = episodes[episodes["task_id"] == "task-0"].tail(3)
+
+    assert last_turn["kind"].tolist() == ["assistant", "call", "call"]
+    assert last_turn["tool_name"].tolist()[2] == "done"
+    assert last_turn["position"].nunique() == 1
+
+
+def test_screen_runs_flags() -> None:
+    outcomes = {
+        "clean": "success",
+        "retry": "failure",
+        "recovered": "success",
+        "task-0": "success",
+        "task-1": "failure",
+    }
+    table = screen_runs(_runs(), outcomes).set_index("task_id")
+
+    retry = table.loc["retry"]
+    assert retry["repeated_calls"] == 2
+    assert retry["max_repeat_streak"] == 3
+    assert retry["calls_after_error"] == 2
+    assert retry["repeated_after_error"] == 2
+    assert retry["tool_error_rate"] == 1.0
+    assert not retry["recovered"]
+    assert retry[ERROR_RUBRIC] == "no match"
+    assert retry[TOOL_CHOICE_RUBRIC] == "no match"
+
+    recovered = table.loc["recovered"]
+    assert recovered["calls_after_error"] == 1
+    assert recovered["recovered"]
+    assert recovered["tool_error_rate"] == 0.5
+    assert recovered[ERROR_RUBRIC] == "match"
+    assert recovered[TOOL_CORRECTNESS_RUBRIC] == "no match"
+
+    assert table.loc["task-1", INTENT_RUBRIC] == "no match"
+    assert table.loc["task-0", INTENT_RUBRIC] == "match"
+    assert not table.loc["clean", "needs_judging"]
+    assert not table.loc["task-0", "needs_judging"]
+
+    cont, _, _ = evaluate_rubric(table, ERROR_RUBRIC)
+    assert cont.loc["Failure", "Flag (no match)"] == 1
+    assert cont.loc["Success", "Flag (no match)"] == 0